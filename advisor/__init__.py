@@ -0,0 +1 @@
+"""Computation code behind the Streamlit advisor in app.py."""
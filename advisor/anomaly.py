@@ -0,0 +1,191 @@
+"""Streaming anomaly scoring for transaction feeds.
+
+Rows are consumed one at a time from a CSV file (read in chunks), a JSONL
+file or any iterable of dicts, so files far larger than memory stream
+through. Each user keeps a fixed-size state: a running mean/variance
+(Welford) and an EWMA level per feature. A row is scored before it updates
+its user's state: the largest ``|value - ewma| / std`` across features.
+Users with too little history are scored against the population stats.
+
+    python -m advisor.anomaly [SOURCE] [--threshold 3.0] [--top 20]
+"""
+import argparse
+import json
+import math
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+from advisor.data import DATASET_PATH
+
+FEATURES = ("monthly_expense_total", "discretionary_spending", "transaction_count", "subscription_services")
+Z_THRESHOLD = 3.0
+EWMA_ALPHA = 0.3
+MIN_HISTORY = 3  # rows a user needs before their own stats are trusted
+MIN_STD_FRACTION = 0.1  # std floor as a fraction of the mean, so flat histories don't explode
+CSV_CHUNK_ROWS = 50_000
+
+Alert = namedtuple("Alert", "row date user_id score feature value expected fraud_flag")
+
+
+class RunningStats:
+    """Welford mean/variance plus an EWMA level for each feature."""
+
+    __slots__ = ("n", "mean", "m2", "ewma")
+
+    def __init__(self, width):
+        self.n = 0
+        self.mean = [0.0] * width
+        self.m2 = [0.0] * width
+        self.ewma = [0.0] * width
+
+    def update(self, values, alpha):
+        self.n += 1
+        n = self.n
+        for i, x in enumerate(values):
+            delta = x - self.mean[i]
+            self.mean[i] += delta / n
+            self.m2[i] += delta * (x - self.mean[i])
+            self.ewma[i] = x if n == 1 else self.ewma[i] + alpha * (x - self.ewma[i])
+
+    def score(self, values):
+        """(max |z|, feature index, expected value) against this state."""
+        best, best_i, expected = 0.0, 0, values[0]
+        n = self.n
+        for i, x in enumerate(values):
+            std = math.sqrt(self.m2[i] / (n - 1)) if n > 1 else 0.0
+            std = max(std, MIN_STD_FRACTION * abs(self.mean[i]), 1e-9)
+            z = abs(x - self.ewma[i]) / std
+            if z > best:
+                best, best_i, expected = z, i, self.ewma[i]
+        return best, best_i, expected
+
+
+def _flag(value):
+    """0/1 fraud flag; blank (NaN), missing or non-numeric cells count as 0."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0
+    return int(value) if math.isfinite(value) else 0
+
+
+class StreamingScorer:
+    def __init__(self, features=FEATURES, threshold=Z_THRESHOLD, alpha=EWMA_ALPHA, min_history=MIN_HISTORY):
+        self.features = tuple(features)
+        self.threshold = threshold
+        self.alpha = alpha
+        self.min_history = min_history
+        self.users = {}
+        self.population = RunningStats(len(self.features))
+        self.rows = 0
+        self.flagged = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def update(self, user_id, values):
+        """Score one row, then fold it into the stats; returns (score, feature index, expected)."""
+        stats = self.users.get(user_id)
+        if stats is None:
+            stats = self.users[user_id] = RunningStats(len(values))
+        reference = stats if stats.n >= self.min_history else self.population
+        result = reference.score(values) if reference.n >= self.min_history else (0.0, 0, values[0])
+        stats.update(values, self.alpha)
+        self.population.update(values, self.alpha)
+        return result
+
+    def score_rows(self, rows):
+        """Yield an Alert for every row whose score reaches the threshold."""
+        features = self.features
+        start = time.perf_counter()
+        try:
+            for row in rows:
+                self.rows += 1
+                try:
+                    values = [float(row[f]) for f in features]
+                except (KeyError, TypeError, ValueError):
+                    continue  # malformed row: skip, don't poison the stats
+                if not all(map(math.isfinite, values)):
+                    continue  # blank CSV field (NaN) or inf: a single one would corrupt mean/m2/EWMA for good
+                score, i, expected = self.update(row.get("user_id"), values)
+                if score >= self.threshold:
+                    self.flagged += 1
+                    yield Alert(self.rows - 1, row.get("date"), row.get("user_id"), score,
+                                features[i], values[i], expected, _flag(row.get("fraud_flag")))
+        finally:
+            self.seconds += time.perf_counter() - start
+
+
+def iter_csv(path, chunksize=CSV_CHUNK_ROWS, columns=None):
+    """Rows of a CSV as dicts, parsed ``chunksize`` rows at a time."""
+    import pandas as pd
+
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda name: name.strip() in wanted  # noqa: E731
+    for chunk in pd.read_csv(path, chunksize=chunksize, usecols=usecols):
+        chunk.columns = chunk.columns.str.strip()
+        yield from chunk.to_dict("records")
+
+
+def iter_jsonl(path):
+    with open(path) as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_source(source, columns=None):
+    """Rows from a CSV/JSONL path, or the iterable itself."""
+    if not isinstance(source, str):
+        return iter(source)
+    if source.endswith((".jsonl", ".json", ".ndjson")):
+        return iter_jsonl(source)
+    return iter_csv(source, columns=columns)
+
+
+def stream_columns(features=FEATURES):
+    return ("date", "user_id", "fraud_flag") + tuple(features)
+
+
+@lru_cache(maxsize=4)
+def dataset_alerts(path=DATASET_PATH, threshold=Z_THRESHOLD):
+    """Alerts over the whole dataset (highest score first) and the run stats."""
+    scorer = StreamingScorer(threshold=threshold)
+    alerts = sorted(scorer.score_rows(iter_source(path, stream_columns())), key=lambda a: -a.score)
+    stats = {
+        "rows": scorer.rows,
+        "users": len(scorer.users),
+        "flagged": scorer.flagged,
+        "flagged_fraud": sum(a.fraud_flag for a in alerts),
+        "rows_per_sec": scorer.rows_per_sec,
+    }
+    return alerts, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a transaction feed and flag anomalous rows.")
+    parser.add_argument("source", nargs="?", default=DATASET_PATH, help="CSV or JSONL file")
+    parser.add_argument("--threshold", type=float, default=Z_THRESHOLD)
+    parser.add_argument("--top", type=int, default=20, help="alerts to print")
+    args = parser.parse_args(argv)
+
+    import heapq
+
+    scorer = StreamingScorer(threshold=args.threshold)
+    # Bounded memory: keep only the top-N alerts while streaming
+    top = heapq.nlargest(args.top, scorer.score_rows(iter_source(args.source, stream_columns())),
+                         key=lambda a: a.score)
+    for alert in top:
+        print(f"{alert.date}  user {alert.user_id:<6} z={alert.score:5.1f}  {alert.feature}="
+              f"{alert.value:,.2f} (expected {alert.expected:,.2f})  fraud_flag={alert.fraud_flag}")
+    print(f"{scorer.rows:,} rows, {len(scorer.users):,} users, {scorer.flagged:,} flagged, "
+          f"{scorer.rows_per_sec:,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Headless JSON API over the snapshot engine.
+
+    python -m advisor.api [--host 127.0.0.1] [--port 8502]
+
+    GET  /health
+    POST /v1/advice        one profile     -> one advice object
+    POST /v1/advice/bulk   {"profiles": [...]} -> {"results": [...]}
+
+A profile uses the sidebar field names (PROFILE_COLUMNS); total_debt and
+current_investments default to 0. Bulk requests go through
+compute_snapshot in a single vectorized pass, the same code the UI uses.
+Errors are JSON too (400 for bad input, 500 otherwise) and close the
+connection, since the request body may not have been read.
+"""
+import argparse
+import json
+import math
+import re
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from advisor.engine import GAUGE_TIERS, PROFILE_COLUMNS, REC_MESSAGES, compute_snapshot
+
+MAX_BULK = 10_000
+MAX_BODY_BYTES = 8 << 20
+OPTIONAL_FIELDS = {"total_debt": 0, "current_investments": 0}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _plain(message):
+    return re.sub(r"<[^>]+>", "", message.replace("<br>", "\n"))
+
+
+def _number(value):
+    """JSON-safe number: NaN ("N/A" months) becomes null, whole floats ints."""
+    if value != value:  # NaN
+        return None
+    return int(value) if float(value).is_integer() else round(value, 2)
+
+
+def _columns(profiles):
+    if not isinstance(profiles, list) or not profiles:
+        raise BadRequest("expected a non-empty list of profiles")
+    if len(profiles) > MAX_BULK:
+        raise BadRequest(f"at most {MAX_BULK} profiles per request")
+    columns = {}
+    for name in PROFILE_COLUMNS:
+        values = []
+        for i, profile in enumerate(profiles):
+            if not isinstance(profile, dict):
+                raise BadRequest(f"profile {i} is not an object")
+            value = profile.get(name, OPTIONAL_FIELDS.get(name))
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise BadRequest(f"profile {i}: {name} must be a number")
+            # json.loads accepts NaN, Infinity, 1e400 and integers too big for a float
+            try:
+                value = float(value)
+            except OverflowError:
+                value = math.inf
+            if not math.isfinite(value) or value < 0:
+                raise BadRequest(f"profile {i}: {name} must be a finite, non-negative number")
+            values.append(value)
+        columns[name] = np.array(values, dtype=np.float64)
+    return columns
+
+
+def advise_batch(profiles):
+    """Advice objects for a list of profile dicts."""
+    columns = _columns(profiles)
+    snap = compute_snapshot(columns)
+    lists = {k: v.tolist() for k, v in snap.items()}
+    debt = columns["total_debt"].tolist()
+
+    results = []
+    for i in range(len(profiles)):
+        row = {k: v[i] for k, v in lists.items()}
+        color, suggestion = GAUGE_TIERS[row["gauge_status"]]
+        results.append({
+            "snapshot": {
+                "total_amount": _number(row["total_amount"]),
+                "net_worth": _number(row["net_worth"]),
+                "monthly_save": _number(row["monthly_save"]),
+                "goal_progress": round(row["goal_progress"], 2),
+                "months_needed": _number(row["months_needed"]),
+                "remaining": _number(row["remaining"]),
+            },
+            "recommendation": {
+                "tier": row["rec_color"].replace("rec-", ""),
+                "message": _plain(REC_MESSAGES[row["rec_color"]]),
+            },
+            "plans": {
+                "show": row["show_plans"],
+                "basic": {"monthly": _number(round(row["basic_save"])), "months": _number(row["basic_time"])},
+                "strong": {"monthly": _number(round(row["strong_save"])), "months": _number(row["strong_time"])},
+            },
+            "emergency": {
+                "status": row["gauge_status"],
+                "color": color,
+                "progress": round(row["emergency_progress"], 2),
+                "months_covered": round(row["months_covered"], 2),
+                "required": _number(row["required"]),
+                "ideal_required": _number(row["ideal_required"]),
+                "shortfall": _number(row["shortfall"]),
+                "suggestion": suggestion,
+            },
+            "insights": {
+                "positive_flow": row["positive_flow"],
+                "has_debt": debt[i] > 0,
+                "emergency_ready_pct": round(row["emergency_progress"]),
+                "goal_complete_pct": round(row["goal_progress"]),
+            },
+        })
+    return results
+
+
+def advise(profile):
+    return advise_batch([profile])[0]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive for clients that reuse connections
+    server_version = "FinanceAdvisorAPI/1"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status >= 400:
+            # Unread body bytes would otherwise be parsed as the next request
+            self.close_connection = True
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError as exc:
+            raise BadRequest("invalid Content-Length") from exc
+        if length < 0:
+            # rfile.read(-1) would block until the keep-alive connection closes
+            raise BadRequest("invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise BadRequest("request body too large")
+        try:
+            return json.loads(self.rfile.read(length) or b"null")
+        except ValueError as exc:
+            raise BadRequest(f"invalid JSON: {exc}") from exc
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        try:
+            if self.path == "/v1/advice":
+                self._send(200, advise(self._body()))
+            elif self.path == "/v1/advice/bulk":
+                body = self._body()
+                profiles = body.get("profiles") if isinstance(body, dict) else None
+                self._send(200, {"results": advise_batch(profiles)})
+            else:
+                self._send(404, {"error": "not found"})
+        except BadRequest as exc:
+            self._send(400, {"error": str(exc)})
+        except Exception:
+            traceback.print_exc()
+            self._send(500, {"error": "internal server error"})
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default of 5 drops connections under bursts
+
+
+def serve(host="127.0.0.1", port=8502):
+    return Server((host, port), Handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the advisory engine as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args(argv)
+
+    server = serve(args.host, args.port)
+    print(f"Listening on http://{args.host}:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
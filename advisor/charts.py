@@ -0,0 +1,219 @@
+"""Memoized plotly figure builders for the app pages.
+
+Each builder is keyed on its (hashable) inputs, so a rerun whose chart
+inputs didn't change reuses the already-built figure. The caches are
+bounded LRUs shared by every session in the process; figures are treated
+as read-only once built. plotly (and pandas, via plotly.express) is only
+imported when a figure is first built.
+
+Time series are downsampled with LTTB to at most TREND_MAX_POINTS per
+trace (FINANCE_CHART_POINTS, 0 disables it), and traces that still carry
+more than WEBGL_THRESHOLD points are drawn with Scattergl, so figure JSON
+and browser render time stay flat however long the history gets.
+"""
+import os
+from functools import lru_cache
+
+import numpy as np
+
+CHART_CACHE_SIZE = 64
+TREND_MAX_POINTS = int(os.environ.get("FINANCE_CHART_POINTS", "500"))
+WEBGL_THRESHOLD = 1000
+MARKERS_BELOW = 60  # markers only while individual points are still readable
+
+
+def lttb(x, y, target):
+    """Indices of the Largest-Triangle-Three-Buckets downsample of (x, y).
+
+    Keeps the first and last points and, from each of ``target - 2`` equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the next bucket's average, which preserves
+    peaks and dips that plain striding would drop.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if target >= n or target < 3:
+        return np.arange(n)
+
+    edges = np.append((np.arange(target - 1) * ((n - 2) / (target - 2))).astype(np.int64) + 1, n)
+    keep = np.empty(target, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(target - 2):
+        start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        keep[i + 1] = a
+    return keep
+
+
+def _numeric_axis(x):
+    """x as float64 for LTTB: timestamps as epoch nanoseconds, else positions."""
+    import pandas as pd
+
+    if x.dtype.kind in "iuf":
+        return x.astype(np.float64)
+    try:
+        return pd.to_datetime(x, format="mixed").as_unit("ns").asi8.astype(np.float64)
+    except (TypeError, ValueError):
+        return np.arange(len(x), dtype=np.float64)
+
+
+def time_series_trace(x, y, max_points=TREND_MAX_POINTS, **kwargs):
+    """A Scatter (or Scattergl for large series) trace over the LTTB downsample."""
+    import plotly.graph_objects as go
+
+    x, y = np.asarray(x), np.asarray(y)
+    if max_points and len(y) > max_points:
+        keep = lttb(_numeric_axis(x), y, max_points)
+        x, y = x[keep], y[keep]
+    trace = go.Scattergl if len(y) > WEBGL_THRESHOLD else go.Scatter
+    return trace(x=x, y=y, mode="lines+markers" if len(y) < MARKERS_BELOW else "lines", **kwargs)
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def overview_bar(income, expenses, savings, investments):
+    import pandas as pd
+    import plotly.express as px
+
+    chart_data = pd.DataFrame({
+        "Category": ["Income", "Expenses", "Savings", "Investments"],
+        "Amount": [income, expenses, savings, investments]
+    })
+    fig = px.bar(chart_data, x="Category", y="Amount", color="Category",
+                 text=chart_data["Amount"].apply(lambda x: f"Rs {x:,}"),
+                 color_discrete_sequence=["#8b5cf6", "#ef4444", "#10b981", "#f59e0b"])
+    fig.update_traces(textposition='outside', textfont_size=20, textfont_color="pink")
+    fig.update_layout(
+        showlegend=False, plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+        height=500, font=dict(color="pink", size=20),
+        yaxis=dict(showgrid=False, title="Amount (PKR)", color="pink"),
+        xaxis=dict(color="pink")
+    )
+    return fig
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def spending_pie(categories, amounts):
+    import pandas as pd
+    import plotly.express as px
+
+    df = pd.DataFrame({"Category": categories, "Amount": amounts})
+    fig_pie = px.pie(df, names="Category", values="Amount",
+                     color_discrete_sequence=px.colors.sequential.Purples)
+    fig_pie.update_traces(textinfo="percent+label", pull=0.08)
+    fig_pie.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        font_color='white',
+        legend=dict(orientation="h", y=-0.15)
+    )
+    return fig_pie
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def trend_line(months, income, expenses, max_points=TREND_MAX_POINTS):
+    import plotly.graph_objects as go
+
+    fig_line = go.Figure()
+    fig_line.add_trace(time_series_trace(
+        months,
+        income,
+        max_points,
+        name="Income",
+        line=dict(color="#10b981", width=4),
+    ))
+    fig_line.add_trace(time_series_trace(
+        months,
+        expenses,
+        max_points,
+        name="Expenses",
+        line=dict(color="#ef4444", width=4),
+    ))
+    fig_line.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(255,255,255,0.05)",
+        font_color="white",
+        xaxis_title=None,
+        yaxis_title=None
+    )
+    return fig_line
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def goal_gauge(goal_progress):
+    import plotly.graph_objects as go
+
+    goal_figure = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=goal_progress,
+        gauge={
+            "axis": {"range": [0, 100]},
+            "bar": {"color": "#8b5cf6"},
+            "bgcolor": "rgba(255,255,255,0.07)",
+            "borderwidth": 2,
+            "bordercolor": "white",
+        },
+        number={'suffix': "%"},
+        domain={"x": [0, 1], "y": [0, 1]}
+    ))
+    goal_figure.update_layout(paper_bgcolor="rgba(0,0,0,0)", font_color="white")
+    return goal_figure
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def whatif_heatmap(metric, monthly_income, monthly_expenses, current_savings, net_worth, goal_amount, horizon):
+    """Heatmap of one what-if grid ("months_to_goal" or "net_worth")."""
+    import plotly.graph_objects as go
+    from advisor.whatif import grid_for
+
+    grid = grid_for(monthly_income, monthly_expenses, current_savings, net_worth, goal_amount, horizon)
+    if metric == "months_to_goal":
+        title, colorscale, hover = "Months", "Viridis_r", "%{z:.0f} months"
+    else:
+        title, colorscale, hover = f"Net worth @ {grid['horizon']} mo", "Viridis", "Rs %{z:,.0f}"
+
+    fig = go.Figure(go.Heatmap(
+        z=grid[metric],
+        x=grid["income_growth"],
+        y=grid["expense_cuts"],
+        colorscale=colorscale,
+        colorbar=dict(title=title),
+        hovertemplate="Income growth %{x:.1f}%/yr<br>Expense cut %{y:.0f}%<br>" + hover + "<extra></extra>",
+    ))
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font_color="white",
+        xaxis_title="Income growth (% per year)",
+        yaxis_title="Expense cut (%)",
+        height=480,
+    )
+    return fig
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def goal_allocation(goals, monthly_budget):
+    """Stacked area of the monthly savings split across ``goals`` (a tuple of goals.Goal)."""
+    import plotly.graph_objects as go
+    from advisor.goals import allocate
+
+    plan = allocate(goals, monthly_budget)
+    # Up to the month the last goal is funded (the whole horizon if one never is)
+    months = plan.schedule.shape[1] if np.isnan(plan.finish).any() else max(int(plan.finish.max()), 1)
+    x = np.arange(1, months + 1)
+
+    fig = go.Figure()
+    for goal, row in zip(plan.goals, plan.schedule):
+        fig.add_trace(go.Scatter(x=x, y=row[:months], name=goal.name, mode="lines", stackgroup="split",
+                                 hovertemplate="Month %{x}: Rs %{y:,.0f}<extra>" + goal.name + "</extra>"))
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(255,255,255,0.05)",
+        font_color="white",
+        xaxis_title="Months from now",
+        yaxis_title="Rs per month",
+        legend=dict(orientation="h", y=-0.2),
+    )
+    return fig
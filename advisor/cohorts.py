@@ -0,0 +1,218 @@
+"""Cohort percentiles backed by per-cohort quantile sketches.
+
+"How do I compare to people like me?": each cohort (by default the
+dataset's income_type) keeps one QuantileSketch per metric: savings rate,
+expense ratio and emergency-fund coverage in months. Sketches are built
+once per process, a percentile lookup is a binary search over at most
+``capacity`` centroids, and new rows fold in with ``add`` without
+rescanning the dataset.
+
+The built sketches are saved under CACHE_DIR/cohorts per dataset version,
+so later processes load a few small arrays instead of the dataset (and
+without importing pandas).
+"""
+import os
+import threading
+
+import numpy as np
+
+from advisor.data import CACHE_DIR
+from advisor.features import PROFILE_FEATURES, ROW_COLUMNS, derive, table_path
+
+COHORT_COLUMNS = ("income_type",)
+INCOME_TYPES = ("Salary", "Freelance", "Mixed")
+ALL_USERS = ("All users",)
+SKETCH_CAPACITY = 512
+COHORTS_DIR = os.path.join(CACHE_DIR, "cohorts")
+
+# metric -> True when a higher value is better
+METRICS = {
+    "savings_rate": True,
+    "expense_ratio": False,
+    "emergency_months": True,
+}
+
+
+class QuantileSketch:
+    """Sorted weighted centroids, compressed to at most ``capacity``.
+
+    Exact until ``capacity`` values are seen; after that, adjacent centroids
+    are merged into equal-weight buckets so ranks stay within 1/capacity.
+    Added values are buffered and merged lazily (on lookup or when the
+    buffer outgrows the sketch).
+    """
+
+    __slots__ = ("capacity", "means", "weights", "cumulative", "_pending", "_pending_n")
+
+    def __init__(self, capacity=SKETCH_CAPACITY):
+        self.capacity = capacity
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.cumulative = np.empty(0)
+        self._pending = []
+        self._pending_n = 0
+
+    @property
+    def n(self):
+        return (self.cumulative[-1] if len(self.cumulative) else 0) + self._pending_n
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if len(values):
+            self._pending.append(values)
+            self._pending_n += len(values)
+            if self._pending_n > self.capacity:
+                self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        new = np.concatenate(self._pending)
+        self._pending, self._pending_n = [], 0
+        means = np.concatenate([self.means, new])
+        weights = np.concatenate([self.weights, np.ones(len(new))])
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        if len(means) > self.capacity:
+            # Equal-weight buckets by cumulative weight (centroid midpoints)
+            cumulative = np.cumsum(weights)
+            bucket = ((cumulative - weights / 2) / cumulative[-1] * self.capacity).astype(np.int64)
+            weights_out = np.bincount(bucket, weights=weights)
+            means_out = np.bincount(bucket, weights=means * weights)
+            keep = weights_out > 0
+            weights = weights_out[keep]
+            means = means_out[keep] / weights
+
+        self.means, self.weights = means, weights
+        self.cumulative = np.cumsum(weights)
+
+    def rank(self, value):
+        """Fraction of the values that are <= ``value``."""
+        self.flush()
+        if not len(self.cumulative):
+            return float("nan")
+        i = np.searchsorted(self.means, value, side="right")
+        return float(self.cumulative[i - 1] / self.cumulative[-1]) if i else 0.0
+
+    def quantile(self, q):
+        self.flush()
+        if not len(self.cumulative):
+            return float("nan")
+        i = np.searchsorted(self.cumulative, q * self.cumulative[-1])
+        return float(self.means[min(i, len(self.means) - 1)])
+
+
+def metric_values(frame):
+    """Per-row metric arrays: materialized feature columns if present, else derived."""
+    if all(m in frame for m in METRICS):
+        return {m: np.asarray(frame[m], dtype=np.float64) for m in METRICS}
+    return derive({k: frame[c] for k, c in ROW_COLUMNS.items()}, METRICS)
+
+
+class CohortIndex:
+    def __init__(self, by=COHORT_COLUMNS, capacity=SKETCH_CAPACITY):
+        self.by = tuple(by)
+        self.capacity = capacity
+        self.sketches = {}  # cohort key -> {metric: QuantileSketch}
+
+    @classmethod
+    def from_frame(cls, frame, by=COHORT_COLUMNS, capacity=SKETCH_CAPACITY):
+        index = cls(by, capacity)
+        index.add(frame)
+        return index
+
+    def _sketches(self, key):
+        sketches = self.sketches.get(key)
+        if sketches is None:
+            sketches = self.sketches[key] = {m: QuantileSketch(self.capacity) for m in METRICS}
+        return sketches
+
+    def add(self, frame):
+        """Fold new dataset rows into their cohorts (and the all-users cohort)."""
+        values = metric_values(frame)
+        groups = frame.groupby(list(self.by), observed=True, sort=False).indices
+        for key, rows in groups.items():
+            key = key if isinstance(key, tuple) else (key,)
+            for metric, sketch in self._sketches(key).items():
+                sketch.add(values[metric][rows])
+        for metric, sketch in self._sketches(ALL_USERS).items():
+            sketch.add(values[metric])
+        # Leave nothing buffered, so concurrent lookups only read
+        for sketches in self.sketches.values():
+            for sketch in sketches.values():
+                sketch.flush()
+
+    @classmethod
+    def load(cls, path, by=COHORT_COLUMNS, capacity=SKETCH_CAPACITY):
+        index = cls(by, capacity)
+        with np.load(path) as saved:
+            for key in saved.files:
+                cohort, metric, field = key.rsplit(":", 2)
+                sketch = index._sketches(tuple(cohort.split("|")))[metric]
+                setattr(sketch, field, saved[key])
+        for sketches in index.sketches.values():
+            for sketch in sketches.values():
+                sketch.cumulative = np.cumsum(sketch.weights)
+        return index
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        arrays = {}
+        for cohort, sketches in self.sketches.items():
+            for metric, sketch in sketches.items():
+                sketch.flush()
+                arrays[f"{'|'.join(map(str, cohort))}:{metric}:means"] = sketch.means
+                arrays[f"{'|'.join(map(str, cohort))}:{metric}:weights"] = sketch.weights
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    def size(self, cohort):
+        sketches = self.sketches.get(tuple(cohort))
+        return int(next(iter(sketches.values())).n) if sketches else 0
+
+    def compare(self, cohort, **values):
+        """Percentiles of the given metric values within ``cohort``.
+
+        Falls back to all users for an unknown cohort. Each metric maps to
+        ``{"percentile", "better_than"}``, where ``better_than`` flips the
+        percentile for lower-is-better metrics.
+        """
+        cohort = tuple(cohort)
+        if cohort not in self.sketches:
+            cohort = ALL_USERS
+        sketches = self.sketches[cohort]
+        result = {"cohort": cohort, "size": self.size(cohort)}
+        for metric, value in values.items():
+            pct = 100 * sketches[metric].rank(value)
+            result[metric] = {"percentile": pct, "better_than": pct if METRICS[metric] else 100 - pct}
+        return result
+
+
+_lock = threading.Lock()
+_index = None
+
+
+def get_cohort_index():
+    """Process-wide sketches over the dataset: loaded if saved, else built once and saved."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                directory = os.path.join(COHORTS_DIR, f"{'+'.join(COHORT_COLUMNS)}-{SKETCH_CAPACITY}")
+                target, _ = table_path(directory=directory)
+                if os.path.exists(target):
+                    _index = CohortIndex.load(target)
+                else:
+                    from advisor.data import dataset_view
+                    from advisor.features import get_feature_table
+
+                    frame = dataset_view(COHORT_COLUMNS)
+                    rows = get_feature_table().rows
+                    for metric in PROFILE_FEATURES:
+                        frame[metric] = rows[metric].to_numpy()
+                    _index = CohortIndex.from_frame(frame)
+                    _index.save(target)
+    return _index
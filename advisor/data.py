@@ -0,0 +1,290 @@
+"""Typed, memory-mappable columnar cache for the finance dataset.
+
+The CSV is parsed once and written as one ``.npy`` file per column next to a
+``meta.json`` describing dtypes, category labels and the source stamp. Later
+loads memory-map only the requested columns instead of re-parsing text.
+
+The cache is rebuilt whenever the source content changes: a differing
+mtime/size triggers a SHA-256 check, and only a differing hash forces the
+rebuild (a plain ``touch`` just refreshes the stamp). Rebuilds hold a thread
+lock and a file lock next to the cache (so executor threads, pool workers and
+other processes build it once), and the new cache is written to a sibling
+directory and swapped in, so readers never see a half-written one.
+
+The app itself reads ``get_dataset``: one compact, read-only copy per
+process (numerics downcast where lossless enough, categoricals as codes)
+that every session only takes column views of. Training and feature
+materialization keep reading the exact float64 cache.
+
+pandas is imported inside the functions that build frames, so importing
+this module (for its paths, or to read a cache stamp) stays cheap.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_PATH = os.path.join(ROOT, "personal_finance_tracker_dataset.csv")
+CACHE_DIR = os.environ.get("FINANCE_CACHE_DIR", os.path.join(ROOT, ".cache"))
+
+DATE_COLUMNS = ("date",)
+CATEGORICAL_COLUMNS = (
+    "category",
+    "income_type",
+    "financial_scenario",
+    "cash_flow_status",
+    "financial_stress_level",
+)
+
+FORMAT_VERSION = 1
+_META = "meta.json"
+
+# float64 -> float32 only if no value moves by more than this (amounts have 2 decimals)
+FLOAT32_TOLERANCE = 5e-3
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def cache_dir_for(path, cache_dir=None):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir or CACHE_DIR, name)
+
+
+def _read_meta(target):
+    try:
+        with open(os.path.join(target, _META)) as fh:
+            meta = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == FORMAT_VERSION else None
+
+
+def _write_meta(target, meta):
+    tmp = os.path.join(target, _META + ".tmp")
+    with open(tmp, "w") as fh:
+        json.dump(meta, fh, indent=1)
+    os.replace(tmp, os.path.join(target, _META))
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock on ``path`` across processes (no-op where fcntl is missing)."""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _codes_dtype(n_categories):
+    return np.int8 if n_categories < 127 else np.int16 if n_categories < 32767 else np.int32
+
+
+def build_cache(path=DATASET_PATH, cache_dir=None, sha256=None):
+    """Parse the CSV once and write the typed columnar cache; returns its meta.
+
+    Called by ``ensure_cache``, which holds the locks.
+    """
+    import pandas as pd
+
+    target = cache_dir_for(path, cache_dir)
+    stamp = _stamp(path)
+    sha256 = sha256 or file_sha256(path)
+
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip()
+    for col in DATE_COLUMNS:
+        if col in df:
+            df[col] = pd.to_datetime(df[col])
+    if "date" in df:
+        df = df.sort_values("date", kind="stable").reset_index(drop=True)
+
+    # Written beside the live cache and swapped in once complete
+    building = f"{target}.building-{os.getpid()}"
+    if os.path.isdir(building):
+        shutil.rmtree(building)
+    os.makedirs(building)
+
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if col in CATEGORICAL_COLUMNS or series.dtype == object or pd.api.types.is_string_dtype(series):
+            cat = pd.Categorical(series)
+            categories = [str(c) for c in cat.categories]
+            values = cat.codes.astype(_codes_dtype(len(categories)))
+            columns[col] = {"kind": "categorical", "categories": categories}
+        else:
+            values = series.to_numpy()
+            columns[col] = {"kind": "datetime" if col in DATE_COLUMNS else "numeric"}
+        columns[col]["dtype"] = str(values.dtype)
+        np.save(os.path.join(building, f"{col}.npy"), values, allow_pickle=False)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "source": os.path.abspath(path),
+        "sha256": sha256,
+        "rows": len(df),
+        "columns": columns,
+        **stamp,
+    }
+    _write_meta(building, meta)
+
+    # A directory can't be replaced while it has files: move the old one aside
+    # first (open memory maps of it stay valid), then drop it
+    retired = f"{target}.old-{os.getpid()}"
+    if os.path.isdir(target):
+        os.replace(target, retired)
+    os.replace(building, target)
+    shutil.rmtree(retired, ignore_errors=True)
+    return meta
+
+
+_cache_lock = threading.Lock()
+
+
+def ensure_cache(path=DATASET_PATH, cache_dir=None):
+    """Return valid cache meta for ``path``, rebuilding only if the CSV changed."""
+    target = cache_dir_for(path, cache_dir)
+    meta = _read_meta(target)
+    stamp = _stamp(path)
+    if meta is not None and all(meta[k] == v for k, v in stamp.items()):
+        return meta
+
+    with _cache_lock, _file_lock(target + ".lock"):
+        # Another thread or process may have finished the job while we waited
+        meta = _read_meta(target)
+        if meta is not None and all(meta[k] == v for k, v in stamp.items()):
+            return meta
+        sha256 = file_sha256(path)
+        if meta is not None and meta["sha256"] == sha256:
+            meta.update(stamp)
+            _write_meta(target, meta)
+            return meta
+        return build_cache(path, cache_dir, sha256=sha256)
+
+
+def load_dataset(columns=None, path=DATASET_PATH, cache_dir=None, mmap=True):
+    """Load the dataset (date-sorted) from the columnar cache.
+
+    Only the requested ``columns`` are opened. Numeric and date columns are
+    read-only memory maps; categorical columns are rebuilt from their codes.
+    """
+    import pandas as pd
+
+    meta = ensure_cache(path, cache_dir)
+    target = cache_dir_for(path, cache_dir)
+    names = list(meta["columns"]) if columns is None else list(columns)
+    unknown = [c for c in names if c not in meta["columns"]]
+    if unknown:
+        raise KeyError(f"Unknown dataset columns: {unknown}")
+
+    data = {}
+    for col in names:
+        info = meta["columns"][col]
+        values = np.load(os.path.join(target, f"{col}.npy"), mmap_mode="r" if mmap else None)
+        if info["kind"] == "categorical":
+            values = pd.Categorical.from_codes(values, categories=info["categories"])
+        data[col] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def compact_array(values, tolerance=FLOAT32_TOLERANCE):
+    """``values`` in the smallest dtype that keeps them (within ``tolerance`` for floats)."""
+    values = np.asarray(values)
+    if values.dtype.kind == "f":
+        finite = values[np.isfinite(values)]
+        if len(finite) and np.all(finite == np.round(finite)) and np.isfinite(values).all():
+            values = values.astype(np.int64)
+        else:
+            narrow = values.astype(np.float32)
+            error = np.abs(narrow.astype(values.dtype) - values)
+            return narrow if not len(finite) or np.nanmax(error) <= tolerance else values
+    if values.dtype.kind in "iu" and len(values):
+        for dtype in (np.int8, np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if info.min <= values.min() and values.max() <= info.max:
+                return values.astype(dtype)
+    return values
+
+
+def _frozen(values):
+    values.flags.writeable = False
+    return values
+
+
+def compact_frame(frame):
+    """Downcast numeric columns; categoricals keep their (already narrow) codes."""
+    import pandas as pd
+
+    data = {}
+    for col in frame:
+        series = frame[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = _frozen(compact_array(series.cat.codes.to_numpy()))
+            data[col] = pd.Categorical.from_codes(codes, dtype=series.dtype)
+        elif series.dtype.kind in "iuf":
+            data[col] = _frozen(compact_array(series.to_numpy()))
+        else:
+            data[col] = _frozen(series.to_numpy().copy())
+    return pd.DataFrame(data, copy=False)
+
+
+_lock = threading.Lock()
+_dataset = None
+
+
+def get_dataset():
+    """Process-wide compact, read-only dataset shared by every session."""
+    global _dataset
+    if _dataset is None:
+        with _lock:
+            if _dataset is None:
+                _dataset = compact_frame(load_dataset(mmap=False))
+    return _dataset
+
+
+def dataset_view(columns=None):
+    """Columns of the shared dataset; a copy-on-write view, never a per-session copy."""
+    frame = get_dataset()
+    return frame if columns is None else frame[list(columns)]
+
+
+def memory_report(path=DATASET_PATH):
+    """Bytes per row per column: plain ``pd.read_csv`` vs the compact shared frame."""
+    import pandas as pd
+
+    naive = pd.read_csv(path)
+    naive.columns = naive.columns.str.strip()
+    compact = get_dataset() if path == DATASET_PATH else compact_frame(load_dataset(path=path, mmap=False))
+    rows = len(naive)
+    before = naive.memory_usage(deep=True, index=False)
+    after = compact.memory_usage(deep=True, index=False)
+    return pd.DataFrame({
+        "dtype_before": naive.dtypes.astype(str),
+        "dtype_after": compact.dtypes.astype(str).reindex(naive.columns),
+        "bytes_per_row_before": before / rows,
+        "bytes_per_row_after": after.reindex(naive.columns) / rows,
+    })
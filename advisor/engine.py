@@ -0,0 +1,179 @@
+"""Vectorized "financial snapshot" engine.
+
+Every number the Overview and Insights pages show is derived here from a
+batch of profiles, so the app (one user) and nightly reports (tens of
+thousands of users) run exactly the same code.
+"""
+import numpy as np
+
+# Sidebar inputs that make up one profile
+PROFILE_COLUMNS = (
+    "monthly_income",
+    "monthly_expenses",
+    "current_savings",
+    "total_debt",
+    "current_investments",
+    "goal_amount",
+)
+
+# ========================= RECOMMENDATION TIERS =========================
+REC_MESSAGES = {
+    "rec-celebrate": "GOAL ACHIEVED!<br><b>Congrats!</b><br>Aap ne kar dikhaya! Ab new big goal set karain",
+    "rec-red": "Goal bohot door hai!<br><b>Action:</b> Har cheez se 15% cut karen<br><b>Extra:</b> Side income start karen",
+    "rec-orange": "Bahut achha ja rahe hain!<br><b>Next Level:</b> Auto-invest on karen<br><b>Tip:</b> Budget app use karen",
+    "rec-green": "Goal qareeb hai!<br><b>Final Push:</b> Thodi si zyada saving<br><b>Shabash!</b> Bas thoda aur!",
+}
+
+# ========================= EMERGENCY GAUGE TIERS =========================
+GAUGE_TIERS = {
+    "Low": ("#ef4444", "Emergency fund BOHOT kam hai — start saving 20% monthly or create a separate emergency account."),
+    "Fair": ("#f59e0b", "Acha progress! Set an auto-transfer to your emergency fund each month."),
+    "Good": ("#10b981", "Shabash! Emergency fund nearly / fully complete — keep it isolated for real emergencies."),
+}
+
+# Plan tiers: (progress upper bound, basic share of income, strong share of income)
+PLAN_TIERS = ((50, 0.25, 0.40), (80, 0.18, 0.28), (np.inf, 0.12, 0.20))
+SHOW_PLANS_BELOW = 95
+
+
+def _column(profiles, name):
+    return np.asarray(profiles[name], dtype=np.float64).reshape(-1)
+
+
+def _safe_div(num, den):
+    # NaN where the denominator is not positive, without divide warnings
+    out = np.full(np.broadcast(num, den).shape, np.nan)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def compute_snapshot(profiles):
+    """Derive every snapshot metric for a batch of profiles in one pass.
+
+    ``profiles`` is a DataFrame or any mapping of PROFILE_COLUMNS to
+    scalars / array-likes of equal length. Returns a dict of NumPy arrays;
+    "N/A" month counts are NaN.
+    """
+    income = _column(profiles, "monthly_income")
+    expenses = _column(profiles, "monthly_expenses")
+    savings = _column(profiles, "current_savings")
+    debt = _column(profiles, "total_debt")
+    investments = _column(profiles, "current_investments")
+    goal = _column(profiles, "goal_amount")
+
+    # ---------- core numbers ----------
+    total_amount = income + savings
+    net_worth = savings + investments - debt
+    monthly_save = np.maximum(0, income - expenses)
+    goal_progress = np.minimum(100.0, np.nan_to_num(_safe_div(savings, goal) * 100))
+    remaining = np.maximum(0, goal - savings)
+    months_needed = np.maximum(0, np.round(_safe_div(goal - savings, monthly_save)))
+
+    # ---------- recommendation ----------
+    rec_color = np.select(
+        [goal_progress >= 100, goal_progress < 50, goal_progress < 90],
+        ["rec-celebrate", "rec-red", "rec-orange"],
+        default="rec-green",
+    )
+
+    # ---------- smart plans ----------
+    show_plans = goal_progress < SHOW_PLANS_BELOW
+    tier_conditions = [goal_progress < bound for bound, _, _ in PLAN_TIERS]
+    basic_save = income * np.select(tier_conditions, [b for _, b, _ in PLAN_TIERS])
+    strong_save = income * np.select(tier_conditions, [s for _, _, s in PLAN_TIERS])
+    basic_time = np.round(_safe_div(remaining, basic_save))
+    strong_time = np.round(_safe_div(remaining, strong_save))
+
+    # ---------- emergency fund ----------
+    required = expenses * 3
+    ideal_required = expenses * 6
+    raw_progress = np.nan_to_num(_safe_div(savings, required) * 100)
+    emergency_progress = np.clip(raw_progress, 0, 100)
+    months_covered = np.nan_to_num(_safe_div(savings, expenses))
+    shortfall = np.maximum(0, required - savings)
+    gauge_status = np.select(
+        [emergency_progress < 50, emergency_progress < 80], ["Low", "Fair"], default="Good"
+    )
+
+    return {
+        "total_amount": total_amount,
+        "net_worth": net_worth,
+        "monthly_save": monthly_save,
+        "goal_progress": goal_progress,
+        "months_needed": months_needed,
+        "remaining": remaining,
+        "rec_color": rec_color,
+        "show_plans": show_plans,
+        "basic_save": basic_save,
+        "strong_save": strong_save,
+        "basic_time": basic_time,
+        "strong_time": strong_time,
+        "required": required,
+        "ideal_required": ideal_required,
+        "emergency_progress": emergency_progress,
+        "months_covered": months_covered,
+        "shortfall": shortfall,
+        "gauge_status": gauge_status,
+        "positive_flow": income > expenses,
+    }
+
+
+def compute_snapshot_frame(profiles):
+    """Same as compute_snapshot but returns a DataFrame aligned with the input."""
+    import pandas as pd
+
+    index = profiles.index if isinstance(profiles, pd.DataFrame) else None
+    return pd.DataFrame(compute_snapshot(profiles), index=index)
+
+
+def _scalar(value):
+    # Keep the app's formatting: whole amounts stay ints, missing months are "N/A"
+    value = value.item()
+    if isinstance(value, float):
+        if np.isnan(value):
+            return "N/A"
+        if value.is_integer():
+            return int(value)
+    return value
+
+
+def snapshot_for(**profile):
+    """Single-profile snapshot as plain Python values, with display text attached."""
+    row = {k: _scalar(v[0]) for k, v in compute_snapshot(profile).items()}
+    row["goal_progress"] = float(row["goal_progress"])
+    row["emergency_progress"] = float(row["emergency_progress"])
+    row["months_covered"] = float(row["months_covered"])
+    row["rec_msg"] = REC_MESSAGES[row["rec_color"]]
+    row["gauge_color"], row["suggestion"] = GAUGE_TIERS[row["gauge_status"]]
+    row["angle"] = row["emergency_progress"] * 3.6
+    return row
+
+
+class Profile:
+    """One session's sidebar inputs.
+
+    ``__slots__`` keeps it to a fixed handful of pointers (no per-instance
+    ``__dict__``); equality compares values, so a session can tell whether
+    anything changed since the last rerun.
+    """
+
+    __slots__ = PROFILE_COLUMNS + ("income_type", "goal_name", "goal_date")
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def columns(self):
+        """The PROFILE_COLUMNS values, as compute_snapshot/snapshot_for take them."""
+        return {name: getattr(self, name) for name in PROFILE_COLUMNS}
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return isinstance(other, Profile) and self.as_dict() == other.as_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Profile({', '.join(f'{k}={v!r}' for k, v in self.as_dict().items())})"
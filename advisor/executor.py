@@ -0,0 +1,76 @@
+"""Shared background executor with request coalescing.
+
+One thread pool per app process, shared by every Streamlit session, for
+I/O-bound or GIL-releasing (NumPy) work. Requests are keyed by function and
+arguments: an identical request that is already running gets the same
+Future instead of a second job, and the last RESULT_CACHE_SIZE finished
+Futures are kept so repeats (everyone starting from the default sidebar
+values) resolve instantly.
+
+There is deliberately no process pool: Streamlit runs app.py as __main__,
+which rules out spawn/forkserver workers, and forking from the threaded
+server can copy a lock another thread holds (say ``advisor.data._lock``)
+into a child that then waits on it forever.
+"""
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+THREAD_WORKERS = int(os.environ.get("FINANCE_THREAD_WORKERS", "8"))
+RESULT_CACHE_SIZE = 256
+
+
+class SharedExecutor:
+    def __init__(self, thread_workers=THREAD_WORKERS, cache_size=RESULT_CACHE_SIZE):
+        self.thread_workers = thread_workers
+        self.cache_size = cache_size
+        self._threads = None
+        self._lock = threading.Lock()
+        self._futures = OrderedDict()  # key -> Future (running, or finished and cached)
+        self.submitted = 0
+        self.coalesced = 0
+
+    def _pool(self):
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.thread_workers, thread_name_prefix="finance-io")
+        return self._threads
+
+    def submit(self, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` on the pool, coalescing duplicates."""
+        key = (fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None and not (future.done() and future.exception() is not None):
+                self._futures.move_to_end(key)
+                self.coalesced += 1
+                return future
+            future = self._pool().submit(fn, *args, **kwargs)
+            self._futures[key] = future
+            self.submitted += 1
+            # Only finished futures may be evicted; running ones are still being shared
+            excess = len(self._futures) - self.cache_size
+            for old_key in list(self._futures)[:max(excess, 0)]:
+                if self._futures[old_key].done():
+                    del self._futures[old_key]
+        return future
+
+    def shutdown(self):
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+
+
+_lock = threading.Lock()
+_executor = None
+
+
+def get_executor():
+    """Process-wide executor shared by all sessions."""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = SharedExecutor()
+                atexit.register(_executor.shutdown)
+    return _executor
@@ -0,0 +1,173 @@
+"""Derived-feature definitions shared by training, serving and the app.
+
+Every derived feature is defined once here as a vectorized function of
+base columns. The same definitions build the model's training table, the
+per-row cohort metrics and the single-row features the predictor and the
+Insights page use at serving time, so no feature is computed two ways.
+
+``materialize`` evaluates them over the whole dataset once per dataset
+version (the columnar cache's SHA-256) and FEATURE_VERSION, and keeps the
+result as an ``.npz`` table under CACHE_DIR/features; later processes only
+load it.
+"""
+import os
+import threading
+
+import numpy as np
+
+from advisor.data import CACHE_DIR, DATASET_PATH, ensure_cache, load_dataset
+
+FEATURE_VERSION = 1
+FEATURES_DIR = os.path.join(CACHE_DIR, "features")
+
+# Base name -> dataset column, for per-row features
+ROW_COLUMNS = {
+    "income": "monthly_income",
+    "expenses": "monthly_expense_total",
+    "emergency_fund": "emergency_fund",
+}
+
+
+def extra_spendings(expenses, savings):
+    """Spending beyond what was saved (the notebook's definition)."""
+    return np.maximum(0, expenses - savings)
+
+
+def savings_rate(income, expenses):
+    """Share of income left after expenses, floored at 0."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(income > 0, np.maximum(0, income - expenses) / income, np.nan)
+
+
+def expense_ratio(income, expenses):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(income > 0, expenses / income, np.nan)
+
+
+def emergency_months(emergency_fund, expenses):
+    """Months of expenses the emergency fund covers."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(expenses > 0, emergency_fund / expenses, np.nan)
+
+
+# name -> (base inputs, definition)
+DERIVED = {
+    "extra_spendings": (("expenses", "savings"), extra_spendings),
+    "savings_rate": (("income", "expenses"), savings_rate),
+    "expense_ratio": (("income", "expenses"), expense_ratio),
+    "emergency_months": (("emergency_fund", "expenses"), emergency_months),
+}
+
+MODEL_FEATURES = ("income", "expenses", "extra_spendings", "credit_score")
+PROFILE_FEATURES = ("savings_rate", "expense_ratio", "emergency_months")
+
+
+def derive(base, names):
+    """Evaluate the derived features ``names`` over a mapping of base columns.
+
+    Values may be whole columns or scalars; the result has the same shape.
+    """
+    out = {}
+    for name in names:
+        inputs, definition = DERIVED[name]
+        out[name] = definition(*(np.asarray(base[c], dtype=np.float64) for c in inputs))
+    return out
+
+
+def profile_features(income, expenses, emergency_fund):
+    """PROFILE_FEATURES for one profile, as floats."""
+    values = derive({"income": income, "expenses": expenses, "emergency_fund": emergency_fund},
+                    PROFILE_FEATURES)
+    return {name: float(value) for name, value in values.items()}
+
+
+class FeatureTable:
+    """Materialized features for one dataset version.
+
+    ``monthly`` is the notebook's df_monthly (model features and
+    savings_next_* targets); ``rows`` holds PROFILE_FEATURES aligned with the
+    dataset's (date-sorted) rows.
+    """
+
+    def __init__(self, monthly, rows, version):
+        self.monthly = monthly
+        self.rows = rows
+        self.version = version
+        observed = monthly.loc[monthly["credit_score"] > 0, "credit_score"]
+        # Serving fallbacks come from the training distribution, not constants
+        self.defaults = {"credit_score": float(observed.median()) if len(observed) else 0.0}
+
+    @classmethod
+    def build(cls, path=DATASET_PATH, version=None):
+        import pandas as pd
+
+        from advisor.monthly import AGG_COLUMNS, MonthlyAggregateStore
+
+        columns = dict.fromkeys(("date",) + tuple(AGG_COLUMNS) + tuple(ROW_COLUMNS.values()))
+        df = load_dataset(tuple(columns), path=path)
+        monthly = MonthlyAggregateStore.from_frame(df).frame()
+        rows = pd.DataFrame(derive({k: df[c] for k, c in ROW_COLUMNS.items()}, PROFILE_FEATURES))
+        return cls(monthly, rows, version)
+
+    @classmethod
+    def load(cls, path, version=None):
+        import pandas as pd
+
+        with np.load(path) as saved:
+            frames = {"monthly": {}, "rows": {}}
+            for key in saved.files:
+                table, column = key.split(":", 1)
+                frames[table][column] = saved[key]
+        return cls(pd.DataFrame(frames["monthly"]), pd.DataFrame(frames["rows"]), version)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        arrays = {f"monthly:{c}": self.monthly[c].to_numpy() for c in self.monthly}
+        arrays.update({f"rows:{c}": self.rows[c].to_numpy() for c in self.rows})
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    def training_frame(self):
+        return self.monthly.dropna().reset_index(drop=True)
+
+    def model_row(self, income, expenses, savings, credit_score=None):
+        """MODEL_FEATURES for one profile, derived exactly as in training."""
+        base = {
+            "income": income,
+            "expenses": expenses,
+            "savings": savings,
+            "credit_score": self.defaults["credit_score"] if credit_score is None else credit_score,
+        }
+        base.update(derive(base, ("extra_spendings",)))
+        return np.array([float(base[name]) for name in MODEL_FEATURES])
+
+
+def table_path(path=DATASET_PATH, directory=FEATURES_DIR):
+    sha256 = ensure_cache(path)["sha256"]
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(directory, f"{name}-{sha256[:16]}-v{FEATURE_VERSION}.npz"), sha256
+
+
+def materialize(path=DATASET_PATH, directory=FEATURES_DIR):
+    """The feature table for the dataset's current version, built at most once."""
+    target, sha256 = table_path(path, directory)
+    if os.path.exists(target):
+        return FeatureTable.load(target, sha256)
+    table = FeatureTable.build(path, sha256)
+    table.save(target)
+    return table
+
+
+_lock = threading.Lock()
+_table = None
+
+
+def get_feature_table():
+    """Process-wide feature table for the bundled dataset."""
+    global _table
+    if _table is None:
+        with _lock:
+            if _table is None:
+                _table = materialize()
+    return _table
@@ -0,0 +1,148 @@
+"""Array-backed evaluator for the trained Random Forest.
+
+A fitted RandomForestRegressor (plus its StandardScaler) is flattened into a
+handful of contiguous NumPy arrays stored in one ``.npz``: every tree's nodes
+are concatenated, child pointers are made global, and leaves point to
+themselves so evaluation is a fixed number of vectorized steps. Loading it
+needs neither sklearn nor unpickling. The export records the SHA-256 of the
+joblib files it came from, so a stale one is detected after a retrain.
+
+    python -m advisor.flatforest [--model finance_model.joblib] [--scaler scaler.joblib] [--out forest.npz]
+"""
+import argparse
+import os
+
+import numpy as np
+
+from advisor.data import file_sha256
+
+FOREST_FILE = "forest.npz"
+BATCH_ROWS = 256  # rows per evaluation block; small blocks stay cache-resident
+
+
+def export_forest(model, scaler=None):
+    """Flatten a fitted forest (and optional StandardScaler) into arrays."""
+    trees = [est.tree_ for est in model.estimators_]
+    sizes = np.array([t.node_count for t in trees])
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    feature, threshold, left, right, value = [], [], [], [], []
+    for tree, offset in zip(trees, offsets):
+        is_leaf = tree.children_left == -1
+        own = np.arange(tree.node_count) + offset
+        left.append(np.where(is_leaf, own, tree.children_left + offset))
+        right.append(np.where(is_leaf, own, tree.children_right + offset))
+        # Leaves compare feature 0 against +inf and always stay put
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+        value.append(tree.value[:, :, 0])
+
+    arrays = {
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "left": np.concatenate(left).astype(np.int32),
+        "right": np.concatenate(right).astype(np.int32),
+        "value": np.ascontiguousarray(np.concatenate(value), dtype=np.float64),
+        "roots": offsets.astype(np.int32),
+        "depth": np.array(max(t.max_depth for t in trees), dtype=np.int32),
+    }
+    if scaler is not None:
+        arrays["scale_mean"] = np.asarray(scaler.mean_, dtype=np.float64)
+        arrays["scale_scale"] = np.asarray(scaler.scale_, dtype=np.float64)
+    return arrays
+
+
+def save_forest(path, model, scaler=None, sources=()):
+    """Write the export; ``sources`` are the artifact files it was made from."""
+    arrays = export_forest(model, scaler)
+    arrays["sources"] = np.array([file_sha256(p) for p in sources], dtype=str)
+    np.savez(path, **arrays)
+
+
+def is_current(path, sources):
+    """True unless ``sources`` exist and differ from what the export at ``path`` was made from."""
+    if not all(os.path.exists(p) for p in sources):
+        return True  # the export is all there is to load
+    with np.load(path) as saved:
+        recorded = list(saved["sources"]) if "sources" in saved.files else None
+    return recorded == [file_sha256(p) for p in sources]
+
+
+class FlatForest:
+    """Predicts like ``RandomForestRegressor.predict`` from flattened arrays."""
+
+    def __init__(self, arrays):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.depth = int(arrays["depth"])
+        # Interleaved [left, right] pairs so each step is a single gather
+        self.children = np.column_stack([self.left, self.right]).ravel()
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as saved:
+            return cls({k: saved[k] for k in saved.files})
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left, self.right, self.value, self.roots))
+
+    def _leaves(self, X):
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        flat_x = X.ravel()
+        row_base = (np.arange(len(X)) * X.shape[1])[:, None]
+        node = np.tile(self.roots, (len(X), 1))
+        for _ in range(self.depth):
+            go_right = np.take(flat_x, row_base + np.take(self.feature, node)) > np.take(self.threshold, node)
+            node = np.take(self.children, 2 * node + go_right)
+        return node
+
+    def predict(self, X):
+        X = np.atleast_2d(X)
+        out = np.empty((len(X), self.value.shape[1]))
+        for start in range(0, len(X), BATCH_ROWS):
+            block = X[start:start + BATCH_ROWS]
+            out[start:start + BATCH_ROWS] = self.value[self._leaves(block)].mean(axis=1)
+        return out
+
+
+class FlatScaler:
+    """StandardScaler.transform from the exported mean/scale arrays."""
+
+    def __init__(self, mean, scale):
+        self.mean = mean
+        self.scale = scale
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as saved:
+            return cls(saved["scale_mean"], saved["scale_scale"])
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+
+def main(argv=None):
+    from advisor.predictor import artifact_paths
+
+    model_path, scaler_path = artifact_paths()
+    parser = argparse.ArgumentParser(description="Export the joblib forest to flat arrays.")
+    parser.add_argument("--model", default=model_path)
+    parser.add_argument("--scaler", default=scaler_path)
+    parser.add_argument("--out", default=None, help=f"defaults to {FOREST_FILE} next to the model")
+    args = parser.parse_args(argv)
+
+    import joblib
+
+    out = args.out or os.path.join(os.path.dirname(args.model), FOREST_FILE)
+    save_forest(out, joblib.load(args.model), joblib.load(args.scaler), sources=(args.model, args.scaler))
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Multi-goal savings allocator.
+
+Splits a fixed monthly savings budget across prioritized goals with
+deadlines so that as few deadlines as possible are missed.
+
+Funding goals one after another in earliest-deadline order meets every
+deadline whenever that is possible at all. When it is not, goals are
+dropped with Moore-Hodgson: walk the goals by deadline and, while the
+running total overshoots the budget available by the current deadline,
+drop the largest goal kept so far. That is the classic optimal rule for
+the fewest late goals. Priority only breaks ties (same size, same
+deadline) and orders the dropped goals, which are funded afterwards by
+priority then deadline. ``python -m advisor.goals`` checks the count
+against brute force on random cases.
+
+Sorting dominates (O(n log n)); the month-by-month schedule for all goals
+over the horizon is a single clip over prefix sums, so dozens of goals
+over 30 years take well under a millisecond to plan.
+"""
+import argparse
+import heapq
+import itertools
+import random
+from collections import namedtuple
+
+import numpy as np
+
+MAX_HORIZON = 360  # months (30 years)
+
+# deadline: months from now (1 = by the end of this month); priority: 1 = most important
+Goal = namedtuple("Goal", "name amount deadline priority saved", defaults=(3, 0))
+
+Allocation = namedtuple("Allocation", "goals order schedule finish on_time")
+
+
+def _needs(goals):
+    return np.array([max(0.0, float(g.amount) - float(g.saved)) for g in goals])
+
+
+def funding_order(goals, monthly_budget):
+    """Goal indices in the order they get funded: on-time set (EDF), then the dropped ones."""
+    needs = _needs(goals)
+    by_deadline = sorted(range(len(goals)), key=lambda i: (goals[i].deadline, goals[i].priority))
+    kept, total, dropped = [], 0.0, []
+    for i in by_deadline:
+        heapq.heappush(kept, (-needs[i], -goals[i].priority, i))
+        total += needs[i]
+        while kept and total > monthly_budget * max(goals[i].deadline, 0):
+            neg_need, _, j = heapq.heappop(kept)
+            total += neg_need
+            dropped.append(j)
+    on_time = {i for _, _, i in kept}
+    return ([i for i in by_deadline if i in on_time]
+            + sorted(dropped, key=lambda i: (goals[i].priority, goals[i].deadline)))
+
+
+def allocate(goals, monthly_budget, horizon=MAX_HORIZON):
+    """Plan ``monthly_budget`` per month across ``goals``.
+
+    Returns an Allocation whose ``schedule`` is an (n_goals, horizon) array
+    of rupees per goal per month (rows in input order), ``finish`` the month
+    each goal is fully funded (NaN if not within the horizon), ``on_time``
+    whether that meets its deadline, and ``order`` the funding order.
+    """
+    goals = [g if isinstance(g, Goal) else Goal(*g) for g in goals]
+    order = funding_order(goals, monthly_budget)
+    needs = _needs(goals)[order]
+
+    upper = np.cumsum(needs)
+    lower = upper - needs
+    funded_by = max(0.0, monthly_budget) * np.arange(1, horizon + 1)
+    # Cumulative rupees each goal has received by the end of each month
+    funded = np.clip(funded_by[None, :], lower[:, None], upper[:, None]) - lower[:, None]
+    schedule = np.diff(funded, axis=1, prepend=0.0)
+
+    done = funded >= needs[:, None] - 1e-6
+    finish = np.where(done.any(axis=1), done.argmax(axis=1) + 1.0, np.nan)
+    finish[needs == 0] = 0
+
+    # Back to input order
+    inverse = np.empty(len(order), dtype=np.int64)
+    inverse[order] = np.arange(len(order))
+    finish = finish[inverse]
+    deadlines = np.array([g.deadline for g in goals], dtype=np.float64)
+    return Allocation(goals, order, schedule[inverse], finish, ~np.isnan(finish) & (finish <= deadlines))
+
+
+def months_until(target, today):
+    """Whole months from ``today`` to ``target`` (a date), at least 1."""
+    return max(1, (target.year - today.year) * 12 + target.month - today.month)
+
+
+def fewest_late(goals, monthly_budget):
+    """Brute force: the fewest late goals over every funding order (small inputs only)."""
+    needs = _needs(goals)
+    best = len(goals)
+    for order in itertools.permutations(range(len(goals))):
+        funded, late = 0.0, 0
+        for i in order:
+            funded += needs[i]
+            late += funded > monthly_budget * max(goals[i].deadline, 0)
+        best = min(best, late)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the allocator against brute force.")
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--max-goals", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    for case in range(args.cases):
+        goals = [Goal(f"g{i}", rng.randint(0, 20) * 50, rng.randint(0, 12), rng.randint(1, 5))
+                 for i in range(rng.randint(1, args.max_goals))]
+        budget = rng.choice([0, 50, 100, 250])
+        late = len(goals) - int(allocate(goals, budget).on_time.sum())
+        best = fewest_late(goals, budget)
+        if late != best:
+            raise SystemExit(f"case {case}: {late} late, {best} possible\n  budget={budget} goals={goals}")
+    print(f"{args.cases} random cases: allocator matches brute force")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Per-section rerun timings with a Prometheus text export.
+
+Off unless FINANCE_METRICS=1 (or enable() is called); when off, every call
+returns after a single flag check. When on, each script run is a timeline:
+``begin(page)`` starts it, ``lap(name)`` charges the time since the previous
+lap to ``name`` (so sections are timed without re-indenting them), and
+``finish()`` closes it and returns the breakdown. Finished runs feed
+process-wide histograms keyed by (page, section), exported as Prometheus text to
+FINANCE_METRICS_FILE and/or served on 127.0.0.1:FINANCE_METRICS_PORT.
+"""
+import bisect
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("FINANCE_METRICS", "") not in ("", "0")
+METRICS_FILE = os.environ.get("FINANCE_METRICS_FILE")
+METRICS_PORT = int(os.environ.get("FINANCE_METRICS_PORT", "0") or 0)
+WRITE_INTERVAL = 5.0  # seconds between metrics-file rewrites
+
+# Histogram upper bounds in seconds (Prometheus "le" labels)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+SECTION_METRIC = "finance_app_section_seconds"
+RERUN_METRIC = "finance_app_rerun_seconds"
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "n")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.n = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.n += 1
+
+
+class Registry:
+    """Thread-safe histograms keyed by (metric, page, section)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, metric, page, section, seconds):
+        key = (metric, page, section)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram()
+            hist.observe(seconds)
+
+    def render(self):
+        """Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            items = sorted(self._histograms.items())
+            for metric in (RERUN_METRIC, SECTION_METRIC):
+                lines.append(f"# TYPE {metric} histogram")
+                for (name, page, section), hist in items:
+                    if name != metric:
+                        continue
+                    labels = f'page="{page}"' + (f',section="{section}"' if section else "")
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS + ("+Inf",), hist.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f"{metric}_sum{{{labels}}} {hist.total:.6f}")
+                    lines.append(f"{metric}_count{{{labels}}} {hist.n}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Timeline:
+    """Laps of one script (or fragment) run."""
+
+    __slots__ = ("page", "start", "mark", "laps")
+
+    def __init__(self, page):
+        self.page = page
+        self.start = self.mark = time.perf_counter()
+        self.laps = []
+
+    def lap(self, section):
+        now = time.perf_counter()
+        seconds = now - self.mark
+        self.mark = now
+        self.laps.append((section, seconds))
+
+    def breakdown(self):
+        """[(section, ms), ...] plus the run total, for display."""
+        total = self.mark - self.start
+        return [(s, sec * 1000) for s, sec in self.laps] + [("total", total * 1000)]
+
+
+_local = threading.local()  # Streamlit runs each session's script on its own thread
+_server = None
+_server_lock = threading.Lock()
+_last_write = 0.0
+
+
+def enable(flag=True):
+    global ENABLED
+    ENABLED = flag
+
+
+def begin(page):
+    """Start timing a run on this thread (no-op when disabled)."""
+    if not ENABLED:
+        return None
+    if METRICS_PORT:
+        _ensure_server()
+    _local.timeline = Timeline(page)
+    return _local.timeline
+
+
+def label(page):
+    """Re-label this thread's run (the page can change mid-run on a nav click)."""
+    timeline = current()
+    if timeline is not None:
+        timeline.page = page
+
+
+def current():
+    """The timeline running on this thread, if any."""
+    return getattr(_local, "timeline", None) if ENABLED else None
+
+
+def lap(section):
+    if not ENABLED:
+        return
+    timeline = getattr(_local, "timeline", None)
+    if timeline is not None:
+        timeline.lap(section)
+
+
+def finish():
+    """Close this thread's run; returns its breakdown (None when disabled)."""
+    if not ENABLED:
+        return None
+    timeline = getattr(_local, "timeline", None)
+    if timeline is None:
+        return None
+    _local.timeline = None
+    for section, seconds in timeline.laps:
+        REGISTRY.observe(SECTION_METRIC, timeline.page, section, seconds)
+    REGISTRY.observe(RERUN_METRIC, timeline.page, "", timeline.mark - timeline.start)
+    if METRICS_FILE:
+        _maybe_write(METRICS_FILE)
+    return timeline.breakdown()
+
+
+def write(path):
+    """Atomically write the Prometheus text to ``path``."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as fh:
+        fh.write(REGISTRY.render())
+    os.replace(tmp, path)
+
+
+def _maybe_write(path):
+    global _last_write
+    now = time.monotonic()
+    if now - _last_write >= WRITE_INTERVAL:
+        _last_write = now
+        write(path)
+
+
+def _ensure_server():
+    global _server
+    if _server is None:
+        with _server_lock:
+            if _server is None:
+                try:
+                    _server = serve(METRICS_PORT)
+                except OSError:  # port taken (e.g. a second app process): keep the file export only
+                    _server = False
+
+
+def serve(port, host="127.0.0.1"):
+    """Serve /metrics from a daemon thread; returns the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = REGISTRY.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
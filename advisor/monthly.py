@@ -0,0 +1,161 @@
+"""Incremental monthly aggregation of the transaction dataset.
+
+Reproduces the notebook's ``df_monthly`` (monthly means of income, expenses,
+savings and credit score, empty months filled with 0, plus extra_spendings
+and the savings_next_1/3/6 targets) from running per-month sums and counts.
+Appending rows only touches the month buckets they fall in and the rolling
+windows that overlap those months.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from advisor.data import CACHE_DIR
+from advisor.features import extra_spendings
+
+# raw dataset column -> df_monthly column
+AGG_COLUMNS = {
+    "monthly_income": "income",
+    "monthly_expense_total": "expenses",
+    "actual_savings": "savings",
+    "credit_score": "credit_score",
+}
+HORIZONS = (1, 3, 6)
+STORE_PATH = os.path.join(CACHE_DIR, "monthly_store.npz")
+
+_SAVINGS = list(AGG_COLUMNS.values()).index("savings")
+
+
+def _month_ordinals(dates):
+    return pd.to_datetime(dates).to_numpy().astype("datetime64[M]").astype(np.int64)
+
+
+class MonthlyAggregateStore:
+    """Running per-month sums/counts with cached derived columns."""
+
+    def __init__(self, first_month=None, sums=None, counts=None):
+        width = len(AGG_COLUMNS)
+        self.first_month = first_month
+        self.sums = np.zeros((0, width)) if sums is None else np.asarray(sums, dtype=np.float64)
+        self.counts = np.zeros((0, width), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        self.means = np.zeros((0, width))
+        self.targets = np.zeros((0, len(HORIZONS)))
+        if len(self.sums):
+            self._refresh(0, len(self.sums))
+
+    # ---------- construction / persistence ----------
+    @classmethod
+    def from_frame(cls, df):
+        store = cls()
+        store.append(df)
+        return store
+
+    @classmethod
+    def load(cls, path=STORE_PATH):
+        with np.load(path) as saved:
+            # An empty store has no first month (older files wrote a 0 placeholder)
+            empty = "first_month" not in saved.files or not len(saved["sums"])
+            return cls(None if empty else int(saved["first_month"]), saved["sums"], saved["counts"])
+
+    def save(self, path=STORE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        arrays = {"sums": self.sums, "counts": self.counts}
+        if self.first_month is not None:
+            arrays["first_month"] = self.first_month
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    def __len__(self):
+        return len(self.sums)
+
+    # ---------- updates ----------
+    def _grow(self, lo_month, hi_month):
+        """Extend the month axis so it covers [lo_month, hi_month]."""
+        if self.first_month is None:
+            self.first_month = lo_month
+        before = max(0, self.first_month - lo_month)
+        after = max(0, hi_month - (self.first_month + len(self) - 1))
+        if before or after:
+            pad = ((before, after), (0, 0))
+            self.sums = np.pad(self.sums, pad)
+            self.counts = np.pad(self.counts, pad)
+            self.means = np.pad(self.means, pad)
+            self.targets = np.pad(self.targets, pad, constant_values=np.nan)
+            self.first_month -= before
+        return before
+
+    def append(self, rows):
+        """Fold new transaction rows in and return the refreshed df_monthly.
+
+        Cost is O(len(rows)) for the bucket updates plus O(months touched + 6)
+        for the rolling targets; untouched history is not recomputed.
+        """
+        if len(rows):
+            months = _month_ordinals(rows["date"])
+            values = np.column_stack([np.asarray(rows[c], dtype=np.float64) for c in AGG_COLUMNS])
+            old_n = len(self)
+            shifted = self._grow(int(months.min()), int(months.max()))
+
+            idx = months - self.first_month
+            present = ~np.isnan(values)
+            np.add.at(self.sums, idx, np.where(present, values, 0.0))
+            np.add.at(self.counts, idx, present)
+
+            if shifted:
+                # Months were prepended: every early window changed, recompute all
+                self._refresh(0, len(self))
+            else:
+                # New trailing months (and any empty gap before them) also need refreshing
+                self._refresh(min(int(idx.min()), old_n), int(idx.max()) + 1)
+        return self.frame()
+
+    def _refresh(self, lo, hi):
+        """Recompute means for months [lo, hi) and every target window touching them."""
+        n = len(self)
+        if len(self.means) != n:
+            self.means = np.zeros_like(self.sums)
+            self.targets = np.full((n, len(HORIZONS)), np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self.sums[lo:hi] / self.counts[lo:hi]
+        self.means[lo:hi] = np.nan_to_num(means)
+
+        # savings_next_k[i] averages savings[i-k+2 : i+2], so a change at month m
+        # affects rows m-1 .. m+k-2
+        start, stop = max(0, lo - 1), min(n, hi + max(HORIZONS) - 1)
+        savings = self.means[:, _SAVINGS]
+        window_lo = max(0, start - max(HORIZONS) + 2)
+        csum = np.concatenate([[0.0], np.cumsum(savings[window_lo:min(n, stop + 1)])])
+        rows = np.arange(start, stop)
+        for j, k in enumerate(HORIZONS):
+            first, last = rows - k + 2, rows + 2  # half-open window in absolute months
+            valid = (first >= 0) & (last <= n)
+            out = np.full(len(rows), np.nan)
+            out[valid] = (csum[last[valid] - window_lo] - csum[first[valid] - window_lo]) / k
+            self.targets[start:stop, j] = out
+
+    # ---------- output ----------
+    def frame(self):
+        """df_monthly as the notebook builds it (targets NaN where undefined)."""
+        n = len(self)
+        if self.first_month is None:
+            months = np.array([], dtype="datetime64[M]")
+        else:
+            months = (np.arange(self.first_month, self.first_month + n)).astype("datetime64[M]")
+        month_end = (months + 1).astype("datetime64[D]") - np.timedelta64(1, "D")
+
+        df = pd.DataFrame({"date": month_end.astype("datetime64[ns]")})
+        for j, name in enumerate(AGG_COLUMNS.values()):
+            df[name] = self.means[:, j]
+        df["extra_spendings"] = extra_spendings(df["expenses"], df["savings"])
+        for j, k in enumerate(HORIZONS):
+            df[f"savings_next_{k}"] = self.targets[:, j]
+        return df
+
+
+def load_store(path=STORE_PATH):
+    """Load the persisted store, or an empty one if none was saved yet."""
+    if os.path.exists(path):
+        return MonthlyAggregateStore.load(path)
+    return MonthlyAggregateStore()
@@ -0,0 +1,210 @@
+"""Cached, batched inference for the Random Forest savings predictor.
+
+The model and scaler trained in the notebook are unpickled once per process
+and shared by every Streamlit session. Predictions for recently seen inputs
+come from a bounded LRU cache keyed on the rounded feature row, so sidebar
+edits and page switches don't re-run the full forest.
+
+The flat export (advisor.flatforest) answers small batches about 50x faster
+than sklearn, but its per-row cost is roughly 2x sklearn's compiled trees,
+so batches of SKLEARN_MIN_ROWS or more go to the joblib model when it is
+available (loaded on the first such batch).
+"""
+import functools
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from advisor.features import MODEL_FEATURES
+from advisor.flatforest import FOREST_FILE, FlatForest, FlatScaler, is_current
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(ROOT, "models")
+LATEST_FILE = "LATEST"
+MODEL_FILE = "finance_model.joblib"
+SCALER_FILE = "scaler.joblib"
+
+FEATURES = MODEL_FEATURES
+TARGETS = ("savings_next_1", "savings_next_3", "savings_next_6")
+
+CACHE_SIZE = 4096
+ROUND_DECIMALS = 0
+SKLEARN_MIN_ROWS = 2000  # sklearn pays back its per-call overhead between 1k and 3k rows
+
+
+class PredictionCache:
+    """Thread-safe LRU of feature-row key -> predicted targets."""
+
+    def __init__(self, maxsize=CACHE_SIZE, decimals=ROUND_DECIMALS):
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, row):
+        return tuple(round(float(v), self.decimals) for v in row)
+
+    def keys(self, rows):
+        """``key`` for every row of a 2-D array, rounded in one NumPy call."""
+        return list(map(tuple, np.round(rows, self.decimals).tolist()))
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SavingsPredictor:
+    """Model + scaler pair with a shared prediction cache.
+
+    ``batch_artifacts`` optionally returns a second (model, scaler) pair used
+    for batches of SKLEARN_MIN_ROWS or more.
+    """
+
+    def __init__(self, model, scaler, cache=None, batch_artifacts=None):
+        self.model = model
+        self.scaler = scaler
+        self.cache = cache if cache is not None else PredictionCache()
+        self.batch_artifacts = batch_artifacts
+        self._batch = None
+
+    def artifacts_for(self, n_rows):
+        """The (model, scaler) pair that predicts a batch of ``n_rows``."""
+        if n_rows < SKLEARN_MIN_ROWS or self.batch_artifacts is None:
+            return self.model, self.scaler
+        if self._batch is None:
+            self._batch = self.batch_artifacts()
+        return self._batch
+
+    def predict_batch(self, rows):
+        """Predict (n, 3) next-1/3/6-month savings for an (n, 4) feature array.
+
+        Cached rows are served from the LRU; all misses go through a single
+        scaler.transform + model.predict call.
+        """
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, len(FEATURES))
+        out = np.empty((len(rows), len(TARGETS)))
+        keys = self.cache.keys(rows)
+        missing = []
+        for i, key in enumerate(keys):
+            hit = self.cache.get(key)
+            if hit is None:
+                missing.append(i)
+            else:
+                out[i] = hit
+        if missing:
+            # Predict on the rounded keys so cached and fresh results agree
+            X = np.array([keys[i] for i in missing])
+            model, scaler = self.artifacts_for(len(missing))
+            if hasattr(scaler, "feature_names_in_"):
+                # The notebook fits the scaler on a DataFrame; keep sklearn's name check happy
+                import pandas as pd
+
+                X = pd.DataFrame(X, columns=scaler.feature_names_in_)
+            preds = np.asarray(model.predict(scaler.transform(X))).reshape(len(missing), -1)
+            out[missing] = preds
+            for i, pred in zip(missing, preds):
+                self.cache.put(keys[i], pred.copy())
+        return out
+
+    def predict_one(self, income, expenses, savings, credit_score=None):
+        """Features are derived by the shared feature table, as in training."""
+        from advisor.features import get_feature_table
+
+        return self.predict_batch([get_feature_table().model_row(income, expenses, savings, credit_score)])[0]
+
+
+_lock = threading.Lock()
+_predictor = None
+
+
+def artifact_paths():
+    """(model, scaler) paths: env overrides, then models/LATEST, then the notebook's files."""
+    directory = ROOT
+    try:
+        with open(os.path.join(MODELS_DIR, LATEST_FILE)) as fh:
+            directory = os.path.join(MODELS_DIR, fh.read().strip())
+    except OSError:
+        pass
+    return (
+        os.environ.get("FINANCE_MODEL_PATH", os.path.join(directory, MODEL_FILE)),
+        os.environ.get("FINANCE_SCALER_PATH", os.path.join(directory, SCALER_FILE)),
+    )
+
+
+def model_available():
+    model_path, scaler_path = artifact_paths()
+    forest_path = os.path.join(os.path.dirname(model_path), FOREST_FILE)
+    return os.path.exists(forest_path) or (os.path.exists(model_path) and os.path.exists(scaler_path))
+
+
+def _load_joblib(model_path, scaler_path):
+    import joblib
+
+    return joblib.load(model_path), joblib.load(scaler_path)
+
+
+def get_predictor():
+    """Process-wide predictor; artifacts are loaded on first use only.
+
+    A ``forest.npz`` export next to the model is preferred over the joblib
+    pickle (see advisor.flatforest), unless it was made from other joblib
+    files than the ones there now (a retrain without a fresh export).
+    """
+    global _predictor
+    if _predictor is None:
+        with _lock:
+            if _predictor is None:
+                model_path, scaler_path = artifact_paths()
+                forest_path = os.path.join(os.path.dirname(model_path), FOREST_FILE)
+                if os.path.exists(forest_path) and is_current(forest_path, (model_path, scaler_path)):
+                    # Flattened export: no unpickling and no sklearn import
+                    batch = None
+                    if os.path.exists(model_path) and os.path.exists(scaler_path):
+                        batch = functools.partial(_load_joblib, model_path, scaler_path)
+                    _predictor = SavingsPredictor(FlatForest.load(forest_path), FlatScaler.load(forest_path),
+                                                  batch_artifacts=batch)
+                else:
+                    _predictor = SavingsPredictor(*_load_joblib(model_path, scaler_path))
+    return _predictor
+
+
+def predict_finance(income, expenses, savings, credit_score=None):
+    """App-side version of the notebook's predict_finance().
+
+    Without a ``credit_score`` the training data's median is used.
+    """
+    p = get_predictor().predict_one(income, expenses, savings, credit_score)
+
+    health = "Excellent" if p[0] > savings else "Poor" if p[0] < 0 else "Good"
+
+    return {
+        "next_month": float(p[0]),
+        "next_3_months": float(p[1]),
+        "next_6_months": float(p[2]),
+        "health": health,
+    }
@@ -0,0 +1,306 @@
+"""PDF report generator (fpdf2).
+
+One report covers the Overview cards, goal progress, the savings plans, the
+emergency-fund gauge and the income/expense chart. ``build_report`` returns
+the bytes for the app's download button; batch mode renders one report per
+dataset user_id across a process pool, each worker writing its PDFs
+straight to disk.
+
+    python -m advisor.report [--out reports] [--jobs N] [--limit N]
+
+Reports use the built-in PDF core fonts, so nothing is embedded or parsed
+per document. Gauge images are rendered once per (percent, colour) and
+reused across documents, and each worker loads the dataset index once.
+"""
+import argparse
+import io
+import os
+import re
+import time
+from datetime import date
+from functools import lru_cache
+
+from advisor.engine import snapshot_for
+
+REPORTS_DIR = "reports"
+CHUNK_USERS = 32  # user_ids per worker task
+REPORT_COLUMNS = (
+    "monthly_income", "monthly_expense_total", "emergency_fund",
+    "debt_to_income_ratio", "investment_amount", "budget_goal",
+)
+
+BRAND = (16, 185, 129)
+INK = (31, 41, 55)
+MUTED = (107, 114, 128)
+CHART_COLORS = ((52, 211, 153), (248, 113, 113), (96, 165, 250), (251, 191, 36))
+
+_REPLACEMENTS = {"—": "-", "–": "-", "→": "->", "•": "-", "’": "'"}
+
+
+def _text(value):
+    """Core fonts are Latin-1 only: map common symbols, drop the rest (emoji)."""
+    text = str(value)
+    for old, new in _REPLACEMENTS.items():
+        text = text.replace(old, new)
+    text = re.sub(r"<br\s*/?>", " ", text)
+    text = re.sub(r"<[^>]+>", "", text)
+    return text.encode("latin-1", "ignore").decode("latin-1").strip()
+
+
+@lru_cache(maxsize=256)
+def gauge_png(percent, color):
+    """Donut gauge as PNG bytes; memoized, so documents share identical images."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(2, 2), dpi=110)
+    ax.pie([percent, 100 - percent], colors=[color, "#e5e7eb"], startangle=90, counterclock=False,
+           wedgeprops={"width": 0.28})
+    ax.text(0, 0, f"{percent}%", ha="center", va="center", fontsize=16, fontweight="bold", color="#1f2937")
+    ax.set_aspect("equal")
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", transparent=True, bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+class _Report:
+    def __init__(self):
+        from fpdf import FPDF
+
+        self.pdf = FPDF(format="A4")
+        self.pdf.set_auto_page_break(True, margin=15)
+        self.pdf.add_page()
+
+    def heading(self, text, size=13):
+        pdf = self.pdf
+        pdf.ln(3)
+        pdf.set_font("Helvetica", "B", size)
+        pdf.set_text_color(*BRAND)
+        pdf.cell(0, 8, _text(text), new_x="LMARGIN", new_y="NEXT")
+        pdf.set_text_color(*INK)
+
+    def line(self, text, size=10, style=""):
+        # Single-line cell: multi_cell's line breaking dominates render time
+        self.pdf.set_font("Helvetica", style, size)
+        self.pdf.cell(0, 5.5, _text(text), new_x="LMARGIN", new_y="NEXT")
+
+    def paragraph(self, text, size=9):
+        self.pdf.set_font("Helvetica", "", size)
+        self.pdf.multi_cell(0, 5, _text(text), new_x="LMARGIN", new_y="NEXT")
+
+    def cards(self, items):
+        pdf = self.pdf
+        width = pdf.epw / len(items)
+        pdf.set_fill_color(243, 244, 246)
+        pdf.set_font("Helvetica", "", 8)
+        pdf.set_text_color(*MUTED)
+        for label, _ in items:
+            pdf.cell(width, 6, _text(label), align="C", fill=True)
+        pdf.ln()
+        pdf.set_font("Helvetica", "B", 11)
+        pdf.set_text_color(*INK)
+        for _, value in items:
+            pdf.cell(width, 8, _text(value), align="C", fill=True)
+        pdf.ln(10)
+
+    def progress_bar(self, percent, height=5):
+        pdf = self.pdf
+        x, y = pdf.get_x(), pdf.get_y()
+        pdf.set_fill_color(229, 231, 235)
+        pdf.rect(x, y, pdf.epw, height, style="F")
+        pdf.set_fill_color(*BRAND)
+        pdf.rect(x, y, pdf.epw * max(0, min(percent, 100)) / 100, height, style="F")
+        pdf.ln(height + 2)
+
+    def bar_chart(self, items, height=45):
+        """Vertical bars drawn as vector shapes (no image needed)."""
+        pdf = self.pdf
+        top = pdf.get_y()
+        peak = max([v for _, v in items] + [1])
+        slot = pdf.epw / len(items)
+        for i, ((label, value), color) in enumerate(zip(items, CHART_COLORS)):
+            bar = height * value / peak
+            x = pdf.l_margin + i * slot + slot * 0.2
+            pdf.set_fill_color(*color)
+            pdf.rect(x, top + height - bar, slot * 0.6, bar, style="F")
+            pdf.set_xy(x, top + height + 1)
+            pdf.set_font("Helvetica", "", 8)
+            pdf.cell(slot * 0.6, 4, _text(label), align="C")
+            pdf.set_xy(x, top + height - bar - 5)
+            pdf.cell(slot * 0.6, 4, f"Rs {value:,.0f}", align="C")
+        pdf.set_xy(pdf.l_margin, top + height + 7)
+
+
+def render_report(profile, goal_name="", subtitle=None):
+    """Lay out one report; returns the FPDF document."""
+    snap = snapshot_for(**profile)
+    report = _Report()
+    pdf = report.pdf
+
+    pdf.set_font("Helvetica", "B", 18)
+    pdf.set_text_color(*INK)
+    pdf.cell(0, 10, "Your Personal Financial Advisor - Report", new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("Helvetica", "", 10)
+    pdf.set_text_color(*MUTED)
+    pdf.cell(0, 6, _text(subtitle or date.today().strftime("%d %B %Y")), new_x="LMARGIN", new_y="NEXT")
+    pdf.set_text_color(*INK)
+
+    report.heading("Overview - Quick Snapshot")
+    report.cards([
+        ("Total Amount", f"Rs {snap['total_amount']:,.0f}"),
+        ("Monthly Income", f"Rs {profile['monthly_income']:,.0f}"),
+        ("Monthly Expenses", f"Rs {profile['monthly_expenses']:,.0f}"),
+        ("Total Savings", f"Rs {profile['current_savings']:,.0f}"),
+        ("Net Worth", f"Rs {snap['net_worth']:,.0f}"),
+    ])
+
+    report.heading("Goal Progress")
+    report.line(f"{goal_name or 'Goal'} -> Target: Rs {profile['goal_amount']:,.0f}", style="B")
+    report.progress_bar(snap["goal_progress"])
+    report.line(f"{snap['goal_progress']:.1f}% Complete - Current ETA: {snap['months_needed']} months")
+    report.paragraph(snap["rec_msg"])
+
+    if snap["show_plans"]:
+        report.heading("Personalized Savings Plans")
+        report.line(f"Basic Plan: save Rs {snap['basic_save']:,.0f}/month - Time: {snap['basic_time']} months")
+        report.line(f"Strong Plan: save Rs {snap['strong_save']:,.0f}/month - Time: {snap['strong_time']} months")
+
+    report.heading("Emergency Fund")
+    gauge_top = pdf.get_y()
+    percent = int(round(snap["emergency_progress"]))
+    pdf.image(io.BytesIO(gauge_png(percent, snap["gauge_color"])), x=pdf.l_margin, y=gauge_top, w=38)
+    pdf.set_xy(pdf.l_margin + 45, gauge_top + 2)
+    pdf.set_left_margin(pdf.l_margin + 45)
+    report.line(f"Status: {snap['gauge_status']} ({snap['emergency_progress']:.0f}% ready)", style="B")
+    report.line(f"Required (3 months): Rs {snap['required']:,.0f}")
+    report.line(f"Ideal (6 months): Rs {snap['ideal_required']:,.0f}")
+    report.line(f"Months covered: {snap['months_covered']:.1f}")
+    report.line(f"Shortfall: Rs {snap['shortfall']:,.0f}")
+    report.paragraph(snap["suggestion"])
+    pdf.set_left_margin(pdf.l_margin - 45)
+    pdf.set_xy(pdf.l_margin, max(pdf.get_y(), gauge_top + 40))
+
+    report.heading("Financial Overview")
+    report.bar_chart([
+        ("Income", profile["monthly_income"]),
+        ("Expenses", profile["monthly_expenses"]),
+        ("Savings", profile["current_savings"]),
+        ("Investments", profile["current_investments"]),
+    ])
+    return pdf
+
+
+def build_report(profile, goal_name=""):
+    """PDF bytes for one profile (the app's download button)."""
+    return bytes(render_report(profile, goal_name).output())
+
+
+def dataset_profile(history):
+    """Sidebar-style profile for a dataset user from their history rows.
+
+    Income/expenses come from the latest month; savings from the latest
+    emergency fund; debt from debt_to_income_ratio against yearly income;
+    investments are the sum invested; the goal is a year of budget_goal.
+    Raises ValueError for an empty history (an unknown user id).
+    """
+    if not len(history):
+        raise ValueError("no history rows")
+    latest = history.iloc[-1]
+    income = float(latest["monthly_income"])
+    return {
+        "monthly_income": round(income),
+        "monthly_expenses": round(float(latest["monthly_expense_total"])),
+        "current_savings": round(float(latest["emergency_fund"])),
+        "total_debt": round(float(latest["debt_to_income_ratio"]) * income * 12),
+        "current_investments": round(float(history["investment_amount"].sum())),
+        "goal_amount": max(1, round(float(latest["budget_goal"]) * 12)),
+    }
+
+
+# ---------- batch mode ----------
+_worker_index = None
+
+
+def _init_worker():
+    global _worker_index
+    from advisor.data import load_dataset
+    from advisor.users import UserIndex
+
+    _worker_index = UserIndex(load_dataset(("user_id", "date") + REPORT_COLUMNS))
+
+
+def _render_users(user_ids, out_dir):
+    """Render and write one PDF per user; returns (documents, pages, skipped user ids)."""
+    if _worker_index is None:
+        _init_worker()
+    pages = 0
+    skipped = []
+    for user_id in user_ids:
+        history = _worker_index.history(user_id)
+        if not len(history):
+            skipped.append(user_id)  # not in the dataset; the rest of the run goes on
+            continue
+        pdf = render_report(dataset_profile(history), "Annual budget goal",
+                            subtitle=f"Dataset user {user_id} - {date.today():%d %B %Y}")
+        pdf.output(os.path.join(out_dir, f"user_{user_id}.pdf"))
+        pages += pdf.pages_count
+    return len(user_ids) - len(skipped), pages, skipped
+
+
+def render_batch(out_dir=REPORTS_DIR, jobs=None, user_ids=None, chunk=CHUNK_USERS):
+    """Render reports for ``user_ids`` (default: every dataset user) in parallel.
+
+    Ids with no dataset rows get no report and are listed under ``skipped``.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    from advisor.data import load_dataset
+
+    if user_ids is None:
+        import numpy as np
+
+        user_ids = np.unique(load_dataset(("user_id",))["user_id"]).tolist()
+    os.makedirs(out_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    documents = pages = 0
+    skipped = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        futures = [pool.submit(_render_users, user_ids[i:i + chunk], out_dir)
+                   for i in range(0, len(user_ids), chunk)]
+        for future in as_completed(futures):
+            done_docs, done_pages, done_skipped = future.result()
+            documents += done_docs
+            pages += done_pages
+            skipped += done_skipped
+    seconds = time.perf_counter() - start
+    return {"documents": documents, "pages": pages, "seconds": seconds,
+            "pages_per_sec": pages / seconds if seconds else 0.0, "skipped": sorted(skipped)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a PDF report for every dataset user.")
+    parser.add_argument("--out", default=REPORTS_DIR)
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--limit", type=int, default=None, help="only the first N user_ids")
+    args = parser.parse_args(argv)
+
+    user_ids = None
+    if args.limit:
+        import numpy as np
+
+        from advisor.data import load_dataset
+
+        user_ids = np.unique(load_dataset(("user_id",))["user_id"])[:args.limit].tolist()
+    stats = render_batch(args.out, args.jobs, user_ids)
+    print(f"{stats['documents']:,} reports, {stats['pages']:,} pages in {stats['seconds']:.1f}s "
+          f"({stats['pages_per_sec']:,.1f} pages/sec) -> {args.out}")
+    if stats["skipped"]:
+        print(f"Skipped {len(stats['skipped'])} user ids with no dataset rows: {stats['skipped'][:10]}")
+
+
+if __name__ == "__main__":
+    main()
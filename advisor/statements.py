@@ -0,0 +1,228 @@
+"""Chunked import of bank-statement CSVs.
+
+A statement is read ``chunksize`` rows at a time with fixed dtypes, each
+transaction is mapped onto the dataset's category taxonomy, and the chunk
+is immediately reduced into per-month income/expense totals and
+per-category spend. Only those running totals are kept, so memory stays
+flat however many years of history the file holds.
+
+Recognised columns (case-insensitive): a date column, either a signed
+``amount`` or separate ``debit``/``credit`` columns, and optionally a
+description and a category. Numeric dates are read day-first when the
+file shows it (a first part above 12, as in 25/03/2024), month-first
+otherwise.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 100_000
+
+# The dataset's category taxonomy (personal_finance_tracker_dataset.csv)
+TAXONOMY = (
+    "Groceries", "Rent", "Utilities", "Transportation", "Healthcare", "Insurance",
+    "Education", "Dining Out", "Entertainment", "Investments",
+)
+OTHER = "Other"
+
+DATE_ALIASES = ("date", "transaction date", "posting date", "value date", "txn date")
+AMOUNT_ALIASES = ("amount", "transaction amount", "amt")
+DEBIT_ALIASES = ("debit", "withdrawal", "withdrawals", "debit amount", "paid out")
+CREDIT_ALIASES = ("credit", "deposit", "deposits", "credit amount", "paid in")
+DESCRIPTION_ALIASES = ("description", "narration", "details", "memo", "payee", "particulars")
+CATEGORY_ALIASES = ("category", "type")
+
+# Description keywords per category, tried in order; first match wins
+KEYWORDS = {
+    "Rent": r"rent|mortgage|landlord|lease",
+    "Groceries": r"grocer|supermarket|mart\b|bazaar|imtiaz|carrefour|metro cash",
+    "Dining Out": r"restaurant|cafe|coffee|pizza|burger|kfc|mcdonald|foodpanda|dine",
+    "Utilities": r"electric|k-?electric|lesco|gas|sngpl|ssgc|water|internet|ptcl|mobile|jazz|zong|telenor|ufone",
+    "Transportation": r"fuel|petrol|diesel|uber|careem|bykea|indrive|taxi|bus|train|parking|toll",
+    "Healthcare": r"pharma|pharmacy|hospital|clinic|doctor|medical|lab\b|dental",
+    "Insurance": r"insurance|takaful|premium|jubilee|efu\b",
+    "Education": r"school|college|university|tuition|course|udemy|coursera|books?\b",
+    "Entertainment": r"netflix|spotify|cinema|movie|game|steam|youtube|concert",
+    "Investments": r"invest|mutual fund|stock|shares|psx|broker|savings certificate|crypto",
+}
+
+# Free-text categories some banks export, mapped onto the taxonomy
+SYNONYMS = {
+    "grocery": "Groceries", "food": "Groceries", "housing": "Rent", "mortgage": "Rent",
+    "bills": "Utilities", "utility": "Utilities", "transport": "Transportation", "travel": "Transportation",
+    "fuel": "Transportation", "health": "Healthcare", "medical": "Healthcare", "restaurants": "Dining Out",
+    "dining": "Dining Out", "shopping": OTHER, "investment": "Investments", "savings": "Investments",
+    "education": "Education", "entertainment": "Entertainment", "insurance": "Insurance",
+}
+_CATEGORY_LOOKUP = {**{c.lower(): c for c in TAXONOMY}, **SYNONYMS}
+
+_NUMERIC_DATE = re.compile(r"^\s*(\d{1,2})[/.-](\d{1,2})[/.-]\d{2,4}\b")
+
+
+class StatementError(ValueError):
+    """The file does not look like a bank statement we can read."""
+
+
+def _find(columns, aliases):
+    for alias in aliases:
+        if alias in columns:
+            return columns[alias]
+    return None
+
+
+def resolve_columns(header):
+    """Map the file's header onto date/amount/debit/credit/description/category."""
+    columns = {str(name).strip().lower(): name for name in header}
+    found = {
+        "date": _find(columns, DATE_ALIASES),
+        "amount": _find(columns, AMOUNT_ALIASES),
+        "debit": _find(columns, DEBIT_ALIASES),
+        "credit": _find(columns, CREDIT_ALIASES),
+        "description": _find(columns, DESCRIPTION_ALIASES),
+        "category": _find(columns, CATEGORY_ALIASES),
+    }
+    if found["date"] is None:
+        raise StatementError("No date column found (expected one of: " + ", ".join(DATE_ALIASES) + ")")
+    if found["amount"] is None and found["debit"] is None and found["credit"] is None:
+        raise StatementError("No amount column found (expected 'amount' or 'debit'/'credit')")
+    return {k: v for k, v in found.items() if v is not None}
+
+
+def detect_dayfirst(dates):
+    """True if numeric dates like 25/03/2024 show the day comes first, False otherwise.
+
+    Ambiguous files (every part <= 12, or ISO dates) are read month-first.
+    """
+    for text in dates.dropna():
+        match = _NUMERIC_DATE.match(str(text))
+        if match:
+            first, second = int(match.group(1)), int(match.group(2))
+            if first > 12 >= second:
+                return True
+            if second > 12 >= first:
+                return False
+    return False
+
+
+def _keyword_labels(texts):
+    """Taxonomy label (or None) per text from KEYWORDS."""
+    texts = pd.Series(texts, dtype="string").fillna("")
+    out = pd.Series(np.full(len(texts), None, dtype=object))
+    for label, pattern in KEYWORDS.items():
+        todo = out.isna()
+        if not todo.any():
+            break
+        out[todo & texts.str.contains(pattern, case=False, regex=True).to_numpy(dtype=bool)] = label
+    return out.to_numpy()
+
+
+def map_categories(description, category=None):
+    """Taxonomy label per transaction: explicit category first, then keywords, else Other.
+
+    Statements repeat the same merchants over and over, so the keyword
+    regexes run once per distinct description rather than once per row.
+    """
+    codes, uniques = pd.factorize(description, use_na_sentinel=False)
+    labels = _keyword_labels(uniques)[codes]
+    if category is not None:
+        explicit = category.astype("string").str.strip().str.lower().map(_CATEGORY_LOOKUP).to_numpy(dtype=object)
+        labels = np.where(pd.isna(explicit), labels, explicit)
+    return pd.Series(labels, index=description.index).fillna(OTHER)
+
+
+class StatementAggregator:
+    """Running per-month and per-category totals."""
+
+    def __init__(self):
+        self.income = {}  # month (Period) -> total credits
+        self.expenses = {}  # month (Period) -> total debits
+        self.categories = {}  # taxonomy label -> total spend
+        self.rows = 0
+        self.skipped = 0
+
+    def update(self, chunk, columns, dayfirst=False):
+        self.rows += len(chunk)
+        dates = pd.to_datetime(chunk[columns["date"]], errors="coerce", format="mixed", dayfirst=dayfirst)
+        if "amount" in columns:
+            amount = chunk[columns["amount"]]
+        else:
+            credit = chunk[columns["credit"]] if "credit" in columns else 0.0
+            debit = chunk[columns["debit"]] if "debit" in columns else 0.0
+            amount = pd.Series(credit, index=chunk.index).fillna(0) - pd.Series(debit, index=chunk.index).fillna(0)
+        valid = dates.notna() & amount.notna()
+        self.skipped += int((~valid).sum())
+        dates, amount = dates[valid], amount[valid]
+
+        month = dates.dt.to_period("M")
+        for target, values in ((self.income, amount.clip(lower=0)), (self.expenses, (-amount).clip(lower=0))):
+            for key, total in values.groupby(month).sum().items():
+                target[key] = target.get(key, 0.0) + float(total)
+
+        spend = (-amount).clip(lower=0)
+        description = chunk.loc[valid, columns["description"]] if "description" in columns \
+            else pd.Series("", index=spend.index)
+        category = chunk.loc[valid, columns["category"]] if "category" in columns else None
+        labels = map_categories(description, category)
+        for key, total in spend[spend > 0].groupby(labels[spend > 0]).sum().items():
+            self.categories[key] = self.categories.get(key, 0.0) + float(total)
+
+    def summary(self):
+        """Totals over every month from the first to the last transaction.
+
+        Months without transactions count as zero, so averages divide by the
+        month span rather than by the months that happen to have rows.
+        """
+        seen = set(self.income) | set(self.expenses)
+        months = list(pd.period_range(min(seen), max(seen), freq="M")) if seen else []
+        income = np.array([self.income.get(m, 0.0) for m in months])
+        expenses = np.array([self.expenses.get(m, 0.0) for m in months])
+        n = max(len(months), 1)
+        return {
+            "rows": self.rows,
+            "skipped": self.skipped,
+            "months": [str(m) for m in months],
+            "monthly_income_series": income.tolist(),
+            "monthly_expense_series": expenses.tolist(),
+            "monthly_income": int(round(income.sum() / n)),
+            "monthly_expenses": int(round(expenses.sum() / n)),
+            "net_savings": int(round(income.sum() - expenses.sum())),
+            "categories": dict(sorted(self.categories.items(), key=lambda kv: -kv[1])),
+        }
+
+
+def import_statement(source, chunksize=CHUNK_ROWS, dayfirst=None):
+    """Stream a statement CSV (path or file-like) into a summary dict.
+
+    ``dayfirst=None`` detects the date order from the first chunk (see
+    detect_dayfirst); the order used is returned as ``summary["dayfirst"]``.
+    Anything unreadable raises StatementError.
+    """
+    aggregator = StatementAggregator()
+    try:
+        header = pd.read_csv(source, nrows=0).columns
+        if hasattr(source, "seek"):
+            source.seek(0)
+        columns = resolve_columns(header)
+
+        dtypes = {columns[k]: "float64" for k in ("amount", "debit", "credit") if k in columns}
+        dtypes.update({columns[k]: "string" for k in ("date", "description", "category") if k in columns})
+        reader = pd.read_csv(source, usecols=list(columns.values()), dtype=dtypes,
+                             thousands=",", chunksize=chunksize)
+        for chunk in reader:
+            if dayfirst is None:
+                dayfirst = detect_dayfirst(chunk[columns["date"]])
+            aggregator.update(chunk, columns, dayfirst)
+    except StatementError:
+        raise
+    except pd.errors.EmptyDataError as exc:
+        raise StatementError("The file is empty") from exc
+    except UnicodeDecodeError as exc:
+        raise StatementError("The file is not a UTF-8 text CSV") from exc
+    except pd.errors.ParserError as exc:
+        raise StatementError(f"The file is not a valid CSV: {exc}") from exc
+    except ValueError as exc:
+        raise StatementError(f"Could not read amounts as numbers: {exc}") from exc
+    summary = aggregator.summary()
+    summary["dayfirst"] = bool(dayfirst)
+    return summary
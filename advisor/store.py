@@ -0,0 +1,185 @@
+"""SQLite persistence for profiles, goals and monthly snapshots.
+
+One WAL-mode connection per process is shared by every Streamlit session
+(serialized by a lock). Writes are queued and flushed together in a single
+transaction once BATCH_SIZE statements are pending, or by a timer at most
+FLUSH_INTERVAL after the first queued write; reads flush first so a session
+always sees its own writes. A failed transaction is rolled back, so the
+shared connection is never left inside one.
+Snapshots are keyed by (user_id, month), and that primary key is the index
+the goal-history queries walk.
+"""
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.environ.get("FINANCE_DB_PATH", os.path.join(ROOT, "finance.db"))
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 2.0  # seconds
+
+PROFILE_FIELDS = (
+    "monthly_income", "monthly_expenses", "current_savings",
+    "total_debt", "current_investments", "income_type",
+)
+SNAPSHOT_FIELDS = ("net_worth", "monthly_save", "goal_amount", "goal_progress", "months_needed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id TEXT PRIMARY KEY,
+    monthly_income INTEGER,
+    monthly_expenses INTEGER,
+    current_savings INTEGER,
+    total_debt INTEGER,
+    current_investments INTEGER,
+    income_type TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS goals (
+    user_id TEXT NOT NULL,
+    goal_name TEXT NOT NULL,
+    goal_amount INTEGER NOT NULL,
+    goal_date TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_id, goal_name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    user_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    net_worth REAL,
+    monthly_save REAL,
+    goal_amount REAL,
+    goal_progress REAL,
+    months_needed REAL,
+    PRIMARY KEY (user_id, date)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_PROFILE = (
+    f"INSERT INTO profiles (user_id, {', '.join(PROFILE_FIELDS)}, updated_at) "
+    f"VALUES ({', '.join('?' * (len(PROFILE_FIELDS) + 2))}) "
+    f"ON CONFLICT(user_id) DO UPDATE SET "
+    + ", ".join(f"{f}=excluded.{f}" for f in PROFILE_FIELDS + ("updated_at",))
+)
+_UPSERT_GOAL = (
+    "INSERT INTO goals (user_id, goal_name, goal_amount, goal_date, updated_at) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(user_id, goal_name) DO UPDATE SET goal_amount=excluded.goal_amount, "
+    "goal_date=excluded.goal_date, updated_at=excluded.updated_at"
+)
+_UPSERT_SNAPSHOT = (
+    f"INSERT OR REPLACE INTO snapshots (user_id, date, {', '.join(SNAPSHOT_FIELDS)}) "
+    f"VALUES ({', '.join('?' * (len(SNAPSHOT_FIELDS) + 2))})"
+)
+
+
+class Store:
+    def __init__(self, path=DB_PATH, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._pending = {}  # sql -> [params, ...]
+        self._pending_n = 0
+        self._timer = None
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.executescript(SCHEMA)
+
+    # ---------- writes (queued) ----------
+    def _queue(self, sql, params):
+        with self._lock:
+            self._pending.setdefault(sql, []).append(params)
+            self._pending_n += 1
+            if self._pending_n >= self.batch_size:
+                self.flush()
+            elif self._timer is None:
+                # Nothing else may come soon: don't leave the write queued until then
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _write(self, batches):
+        """Run {sql: [params, ...]} in one transaction, rolled back on any error."""
+        self.conn.execute("BEGIN")
+        try:
+            for sql, rows in batches.items():
+                self.conn.executemany(sql, rows)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def flush(self):
+        """Write every queued statement in one transaction."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            pending, self._pending, self._pending_n = self._pending, {}, 0
+            self._write(pending)
+
+    def save_profile(self, user_id, **profile):
+        self._queue(_UPSERT_PROFILE, (user_id, *(profile.get(f) for f in PROFILE_FIELDS), time.time()))
+
+    def save_goal(self, user_id, goal_name, goal_amount, goal_date=None):
+        self._queue(_UPSERT_GOAL, (user_id, goal_name, goal_amount,
+                                   goal_date.isoformat() if goal_date else None, time.time()))
+
+    def record_snapshot(self, user_id, date, **values):
+        """Upsert the snapshot for ``date`` (one row per user and month)."""
+        month = date.strftime("%Y-%m") if hasattr(date, "strftime") else str(date)
+        self._queue(_UPSERT_SNAPSHOT, (user_id, month, *(values.get(f) for f in SNAPSHOT_FIELDS)))
+
+    def record_snapshots(self, rows):
+        """Bulk insert (user_id, month, *SNAPSHOT_FIELDS) tuples in one transaction."""
+        with self._lock:
+            self.flush()
+            self._write({_UPSERT_SNAPSHOT: rows})
+
+    # ---------- reads ----------
+    def _query(self, sql, params=()):
+        with self._lock:
+            self.flush()
+            return self.conn.execute(sql, params).fetchall()
+
+    def load_profile(self, user_id):
+        rows = self._query(f"SELECT {', '.join(PROFILE_FIELDS)} FROM profiles WHERE user_id = ?", (user_id,))
+        return dict(zip(PROFILE_FIELDS, rows[0])) if rows else None
+
+    def goals(self, user_id):
+        rows = self._query("SELECT goal_name, goal_amount, goal_date FROM goals WHERE user_id = ? "
+                           "ORDER BY updated_at DESC", (user_id,))
+        return [{"goal_name": n, "goal_amount": a, "goal_date": d} for n, a, d in rows]
+
+    def goal_history(self, user_id, months=12):
+        """The latest ``months`` snapshots, oldest first (an index range scan)."""
+        rows = self._query(
+            f"SELECT date, {', '.join(SNAPSHOT_FIELDS)} FROM snapshots WHERE user_id = ? "
+            "ORDER BY date DESC LIMIT ?", (user_id, months))
+        return [dict(zip(("date",) + SNAPSHOT_FIELDS, row)) for row in reversed(rows)]
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self.conn.close()
+
+
+_lock = threading.Lock()
+_store = None
+
+
+def get_store():
+    """Process-wide store shared by all sessions; flushed at exit."""
+    global _store
+    if _store is None:
+        with _lock:
+            if _store is None:
+                _store = Store()
+                atexit.register(_store.flush)
+    return _store
@@ -0,0 +1,141 @@
+"""Command-line training pipeline for the savings predictor.
+
+    python -m advisor.train [--data CSV] [--out models] [--cv 5] [--jobs -1]
+
+Replaces the notebook's training cells: load -> monthly aggregation ->
+feature engineering (advisor.features; extra_spendings, savings_next_1/3/6) -> cross-validated
+hyperparameter search for the Random Forest, run across all cores. Each run
+writes a versioned directory with compressed model/scaler artifacts and a
+metadata.json holding the metrics, chosen parameters and dataset hash, plus
+the flattened forest.npz the app serves from, and points models/LATEST at it.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+from advisor.data import DATASET_PATH, file_sha256
+from advisor.features import materialize
+from advisor.flatforest import FOREST_FILE, save_forest
+from advisor.predictor import (
+    FEATURES, LATEST_FILE, MODEL_FILE, MODELS_DIR, SCALER_FILE, TARGETS,
+)
+
+METADATA_FILE = "metadata.json"
+
+PARAM_GRID = {
+    "model__n_estimators": [100, 200, 400],
+    "model__max_depth": [None, 8, 16],
+    "model__min_samples_leaf": [1, 2, 4],
+    "model__max_features": [1.0, "sqrt"],
+}
+
+
+def build_training_frame(path=DATASET_PATH):
+    """Monthly features/targets exactly as the notebook builds them (materialized per dataset version)."""
+    return materialize(path).training_frame()
+
+
+def fit(df_monthly, cv=5, n_jobs=-1, seed=42, test_size=0.2, param_grid=None):
+    """Grid-search a scaler + forest pipeline; returns (search, metrics)."""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from sklearn.model_selection import GridSearchCV, KFold, train_test_split
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    X = df_monthly[list(FEATURES)]
+    Y = df_monthly[list(TARGETS)]
+    X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=test_size, random_state=seed)
+
+    pipeline = Pipeline([
+        ("scaler", StandardScaler()),
+        # Parallelism lives in the search (one process per candidate/fold), not in each forest
+        ("model", RandomForestRegressor(random_state=seed, n_jobs=1)),
+    ])
+    search = GridSearchCV(
+        pipeline,
+        param_grid or PARAM_GRID,
+        cv=KFold(n_splits=cv, shuffle=True, random_state=seed),
+        scoring="neg_mean_absolute_error",
+        n_jobs=n_jobs,
+        refit=True,
+    )
+    search.fit(X_train, Y_train)
+
+    pred = search.predict(X_test)
+    metrics = {
+        "cv_mae": float(-search.best_score_),
+        "test_rows": len(X_test),
+        "train_rows": len(X_train),
+    }
+    for j, target in enumerate(TARGETS):
+        metrics[f"test_mae_{target}"] = float(mean_absolute_error(Y_test.iloc[:, j], pred[:, j]))
+        metrics[f"test_r2_{target}"] = float(r2_score(Y_test.iloc[:, j], pred[:, j]))
+    return search, metrics
+
+
+def save_artifacts(search, metrics, dataset_sha256, out_dir=MODELS_DIR, compress=3, extra=None):
+    """Write a versioned artifact directory and point LATEST at it."""
+    import joblib
+    import sklearn
+
+    created = datetime.now(timezone.utc)
+    version = f"{created:%Y%m%d-%H%M%S}-{dataset_sha256[:8]}"
+    target = os.path.join(out_dir, version)
+    os.makedirs(target, exist_ok=True)
+
+    best = search.best_estimator_
+    model_path, scaler_path = os.path.join(target, MODEL_FILE), os.path.join(target, SCALER_FILE)
+    joblib.dump(best.named_steps["model"], model_path, compress=compress)
+    joblib.dump(best.named_steps["scaler"], scaler_path, compress=compress)
+    save_forest(os.path.join(target, FOREST_FILE), best.named_steps["model"], best.named_steps["scaler"],
+                sources=(model_path, scaler_path))
+
+    metadata = {
+        "version": version,
+        "created_at": created.isoformat(),
+        "dataset_sha256": dataset_sha256,
+        "features": list(FEATURES),
+        "targets": list(TARGETS),
+        "best_params": {k.split("__", 1)[1]: v for k, v in search.best_params_.items()},
+        "metrics": metrics,
+        "sklearn_version": sklearn.__version__,
+        **(extra or {}),
+    }
+    with open(os.path.join(target, METADATA_FILE), "w") as fh:
+        json.dump(metadata, fh, indent=2)
+
+    tmp = os.path.join(out_dir, LATEST_FILE + ".tmp")
+    with open(tmp, "w") as fh:
+        fh.write(version + "\n")
+    os.replace(tmp, os.path.join(out_dir, LATEST_FILE))
+    return target, metadata
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the savings predictor.")
+    parser.add_argument("--data", default=DATASET_PATH, help="transactions CSV")
+    parser.add_argument("--out", default=MODELS_DIR, help="artifact root directory")
+    parser.add_argument("--cv", type=int, default=5, help="cross-validation folds")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel workers (-1 = all cores)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--test-size", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    df_monthly = build_training_frame(args.data)
+    search, metrics = fit(df_monthly, cv=args.cv, n_jobs=args.jobs, seed=args.seed, test_size=args.test_size)
+    metrics["train_seconds"] = round(time.perf_counter() - start, 2)
+
+    target, metadata = save_artifacts(
+        search, metrics, file_sha256(args.data), args.out,
+        extra={"seed": args.seed, "cv_folds": args.cv},
+    )
+    print(f"Saved {metadata['version']} to {target}")
+    print(json.dumps(metadata["metrics"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
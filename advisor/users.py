@@ -0,0 +1,60 @@
+"""Per-user row index over the date-sorted dataset.
+
+``order`` holds dataset row positions grouped by user_id (date order kept
+inside each group), and ``starts`` the offset of each user's block, so one
+user's history is a searchsorted + slice instead of a full-frame filter.
+"""
+import threading
+
+import numpy as np
+
+from advisor.data import dataset_view
+
+HISTORY_COLUMNS = ("date", "monthly_income", "monthly_expense_total", "actual_savings")
+
+
+class UserIndex:
+    def __init__(self, frame):
+        self.frame = frame
+        user_ids = np.asarray(frame["user_id"])
+        # Stable sort keeps each user's rows in dataset (date) order
+        self.order = np.argsort(user_ids, kind="stable")
+        self.user_ids, self.starts, self.counts = np.unique(
+            user_ids[self.order], return_index=True, return_counts=True
+        )
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def __contains__(self, user_id):
+        i = np.searchsorted(self.user_ids, user_id)
+        return i < len(self.user_ids) and self.user_ids[i] == user_id
+
+    def rows_for(self, user_id):
+        """Dataset row positions for ``user_id`` in date order (empty if unknown)."""
+        i = np.searchsorted(self.user_ids, user_id)
+        if i == len(self.user_ids) or self.user_ids[i] != user_id:
+            return self.order[:0]
+        return self.order[self.starts[i]:self.starts[i] + self.counts[i]]
+
+    def history(self, user_id, columns=None):
+        frame = self.frame if columns is None else self.frame[list(columns)]
+        return frame.iloc[self.rows_for(user_id)].reset_index(drop=True)
+
+    def busiest_user(self):
+        """user_id with the longest history (a sensible default selection)."""
+        return self.user_ids[np.argmax(self.counts)].item()
+
+
+_lock = threading.Lock()
+_index = None
+
+
+def get_user_index():
+    """Process-wide index over views of the shared dataset's HISTORY_COLUMNS."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = UserIndex(dataset_view(("user_id",) + HISTORY_COLUMNS))
+    return _index
@@ -0,0 +1,62 @@
+"""What-if grid: expense cut % x income growth % -> months to goal, net worth.
+
+Every cell of the GRID_SIZE x GRID_SIZE grid is evaluated in one broadcast
+(cuts x growth rates x months) NumPy computation: income compounds monthly
+at the cell's annual growth rate, expenses drop by the cell's cut, and each
+month saves ``max(0, income - expenses)`` as the snapshot engine does.
+Months to goal is the first month the savings reach the remaining amount
+(NaN if not within MAX_HORIZON); net worth is read at the chosen horizon.
+Grids are cached per (rounded) input, so revisiting sidebar values is free.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+GRID_SIZE = 50
+MAX_EXPENSE_CUT = 50.0  # percent
+MAX_INCOME_GROWTH = 25.0  # percent per year
+MAX_HORIZON = 360  # months (30 years)
+CACHE_SIZE = 128
+
+EXPENSE_CUTS = np.linspace(0, MAX_EXPENSE_CUT, GRID_SIZE)
+INCOME_GROWTH = np.linspace(0, MAX_INCOME_GROWTH, GRID_SIZE)
+
+
+def _frozen(values):
+    values.flags.writeable = False
+    return values
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def whatif_grid(monthly_income, monthly_expenses, current_savings, net_worth, goal_amount, horizon):
+    """Grids indexed [expense cut, income growth].
+
+    Returns ``{"months_to_goal", "net_worth", "expense_cuts", "income_growth",
+    "horizon"}``; arrays are read-only because results are shared.
+    """
+    horizon = int(min(max(horizon, 1), MAX_HORIZON))
+    month = np.arange(MAX_HORIZON, dtype=np.float64)
+    # Monthly factor of each annual growth rate, compounded from month 0
+    growth = (1 + INCOME_GROWTH / 100) ** (1 / 12)
+    income = monthly_income * growth[None, :, None] ** month[None, None, :]
+    expenses = monthly_expenses * (1 - EXPENSE_CUTS / 100)[:, None, None]
+    saved = np.cumsum(np.maximum(0.0, income - expenses), axis=2)
+
+    remaining = max(0.0, goal_amount - current_savings)
+    reached = saved >= remaining
+    months = np.where(reached.any(axis=2), reached.argmax(axis=2) + 1.0, np.nan)
+    if remaining == 0:
+        months[:] = 0
+    return {
+        "months_to_goal": _frozen(months),
+        "net_worth": _frozen(net_worth + saved[:, :, horizon - 1]),
+        "expense_cuts": EXPENSE_CUTS,
+        "income_growth": INCOME_GROWTH,
+        "horizon": horizon,
+    }
+
+
+def grid_for(monthly_income, monthly_expenses, current_savings, net_worth, goal_amount, horizon):
+    """``whatif_grid`` with inputs rounded to whole rupees so cache keys repeat."""
+    return whatif_grid(round(monthly_income), round(monthly_expenses), round(current_savings),
+                       round(net_worth), round(goal_amount), int(horizon))
@@ -1,11 +1,19 @@
 import streamlit as st
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import math
-import plotly.express as px
-import pandas as pd
+import time
+
+from advisor.engine import Profile, snapshot_for
+from advisor import charts, metrics, predictor
+from advisor.cohorts import INCOME_TYPES
+from advisor.simulate import goal_eta
+from advisor.executor import get_executor
+from advisor.goals import Goal, allocate, months_until
+from advisor.store import get_store
 
 # ---------------- Page config ----------------
 st.set_page_config(page_title="Your Financial Advisor — Smart AI", page_icon="trophy", layout="wide")
+metrics.begin(st.session_state.get("page", "overview"))
 
 # ==================== STYLING ====================
 st.markdown("""
@@ -153,108 +161,142 @@ st.markdown("""
 
  
 
+metrics.lap("css")
+
 # ========================= SIDEBAR =========================
 with st.sidebar:
     st.markdown("<h2 style='color:#6CE0AC; text-align:center;'>Your Financial Inputs</h2>", unsafe_allow_html=True)
     st.markdown("<div class='input-section'>", unsafe_allow_html=True)
-    monthly_income = st.number_input("Monthly Income (PKR)", min_value=0, value=60000, step=1000)
-    monthly_expenses = st.number_input("Monthly Expenses (PKR)", min_value=0, value=55000, step=1000)
-    current_savings = st.number_input("Current Savings (PKR)", min_value=0, value=150000, step=5000)
-    total_debt = st.number_input("Total Debt (PKR)", min_value=0, value=0, step=1000)
-    current_investments = st.number_input("Current Investments (PKR)", min_value=0, value=50000, step=1000)
+
+    # Saved profile + goal (SQLite), read once per session so widgets stay stable
+    store = get_store()
+    profile_id = st.text_input("Profile Name", value="default").strip() or "default"
+    saved_key = f"saved:{profile_id}"
+    if saved_key not in st.session_state:
+        goals = store.goals(profile_id)
+        st.session_state[saved_key] = (store.load_profile(profile_id) or {}, goals[0] if goals else {})
+    saved_profile, saved_goal = st.session_state[saved_key]
+
+    # Optional bank statement: streamed in chunks, parsed once per uploaded file
+    uploaded = st.file_uploader("Bank Statement CSV (optional)", type="csv")
+    statement = None
+    if uploaded is not None:
+        cached = st.session_state.get("statement")
+        if cached and cached[0] == uploaded.file_id:
+            statement = cached[1]
+        else:
+            from advisor.statements import StatementError, import_statement
+
+            try:
+                statement = import_statement(uploaded)
+                st.session_state["statement"] = (uploaded.file_id, statement)
+            except StatementError as exc:
+                st.error(f"Statement import failed: {exc}")
+        if statement:
+            order = "day/month" if statement.get("dayfirst") else "month/day"
+            st.caption(f"{statement['rows']:,} transactions over {len(statement['months'])} months imported "
+                       f"(dates read as {order})")
+
+    # Defaults: imported statement > saved profile > built-in
+    defaults = {"monthly_income": 60000, "monthly_expenses": 55000, "current_savings": 150000,
+                "total_debt": 0, "current_investments": 50000, "income_type": INCOME_TYPES[0]}
+    defaults.update({k: v for k, v in saved_profile.items() if v is not None})
+    if statement:
+        defaults.update(monthly_income=statement["monthly_income"], monthly_expenses=statement["monthly_expenses"],
+                        current_savings=max(0, statement["net_savings"]))
+
+    # All sidebar inputs live on one compact Profile (slots, no loose globals)
+    profile = Profile(
+        monthly_income=st.number_input("Monthly Income (PKR)", min_value=0, value=defaults["monthly_income"], step=1000),
+        monthly_expenses=st.number_input("Monthly Expenses (PKR)", min_value=0, value=defaults["monthly_expenses"], step=1000),
+        current_savings=st.number_input("Current Savings (PKR)", min_value=0, value=defaults["current_savings"], step=5000),
+        total_debt=st.number_input("Total Debt (PKR)", min_value=0, value=defaults["total_debt"], step=1000),
+        current_investments=st.number_input("Current Investments (PKR)", min_value=0, value=defaults["current_investments"], step=1000),
+        income_type=st.selectbox("Income Type", INCOME_TYPES,
+                                 index=INCOME_TYPES.index(defaults["income_type"]) if defaults["income_type"] in INCOME_TYPES else 0),
+    )
     st.markdown("</div>", unsafe_allow_html=True)
 
     st.markdown("<h2 style='color:#6CE0AC; text-align:center;'>Your Goal</h2>", unsafe_allow_html=True)
-    goal_name = st.text_input("Goal Name(car 🚙, house 🏡 etc..)")
-    goal_amount = st.number_input("Goal Target Amount (PKR)", min_value=1, value=5000000, step=50000)
+    profile.goal_name = st.text_input("Goal Name(car 🚙, house 🏡 etc..)", value=saved_goal.get("goal_name", ""))
+    profile.goal_amount = st.number_input("Goal Target Amount (PKR)", min_value=1, value=saved_goal.get("goal_amount", 5000000), step=50000)
+    saved_date = saved_goal.get("goal_date")
+    profile.goal_date = st.date_input("Goal Target Date",
+                              value=date.fromisoformat(saved_date) if saved_date else date.today() + timedelta(days=5 * 365))
 
     if st.button("Analyze / Predict", type="primary", use_container_width=True):
         st.success("Analysis Updated!")
 
-# ========================= CALCULATIONS =========================
-total_amount = monthly_income + current_savings
-net_worth = current_savings + current_investments - total_debt
-monthly_save = max(0, monthly_income - monthly_expenses)
-goal_progress = min(100.0, (current_savings / goal_amount * 100) if goal_amount > 0 else 0)
-months_needed = "N/A" if monthly_save <= 0 else max(0, round((goal_amount - current_savings) / monthly_save))
+    # Opt-in timing breakdown of the previous rerun (needs FINANCE_METRICS=1)
+    if metrics.ENABLED and st.checkbox("Show rerun timings", key="perf_panel"):
+        breakdown = st.session_state.get("perf_last") or []
+        st.text("\n".join(f"{section:<22}{ms:8.1f} ms" for section, ms in breakdown) or "No run recorded yet")
 
-remaining = max(0, goal_amount - current_savings)
+metrics.lap("sidebar")
+
+# ========================= CALCULATIONS =========================
+snapshot = snapshot_for(**profile.columns())
+total_amount = snapshot["total_amount"]
+net_worth = snapshot["net_worth"]
+monthly_save = snapshot["monthly_save"]
+goal_progress = snapshot["goal_progress"]
+months_needed = snapshot["months_needed"]
+remaining = snapshot["remaining"]
 
 # ========================= SMART RECOMMENDATION + CELEBRATION =========================
-if goal_progress >= 100:
-    rec_color = "rec-celebrate"
-    rec_msg = "GOAL ACHIEVED!<br><b>Congrats!</b><br>Aap ne kar dikhaya! Ab new big goal set karain"
-elif goal_progress < 50:
-    rec_color = "rec-red"
-    rec_msg = "Goal bohot door hai!<br><b>Action:</b> Har cheez se 15% cut karen<br><b>Extra:</b> Side income start karen"
-elif goal_progress < 90:
-    rec_color = "rec-orange"
-    rec_msg = "Bahut achha ja rahe hain!<br><b>Next Level:</b> Auto-invest on karen<br><b>Tip:</b> Budget app use karen"
-else:
-    rec_color = "rec-green"
-    rec_msg = "Goal qareeb hai!<br><b>Final Push:</b> Thodi si zyada saving<br><b>Shabash!</b> Bas thoda aur!"
+rec_color = snapshot["rec_color"]
+rec_msg = snapshot["rec_msg"]
 
 # ========================= SMART PLANS (Dynamic & Realistic) =========================
-show_plans = goal_progress < 95  # Sirf jab tak goal complete na ho
-
-if show_plans:
-    if goal_progress < 50:
-        basic_save = monthly_income * 0.25
-        strong_save = monthly_income * 0.40
-    elif goal_progress < 80:
-        basic_save = monthly_income * 0.18
-        strong_save = monthly_income * 0.28
-    else:
-        basic_save = monthly_income * 0.12
-        strong_save = monthly_income * 0.20
-
-    basic_time = "N/A" if basic_save <= 0 else round(remaining / basic_save)
-    strong_time = "N/A" if strong_save <= 0 else round(remaining / strong_save)
+show_plans = snapshot["show_plans"]  # Sirf jab tak goal complete na ho
+basic_save, strong_save = snapshot["basic_save"], snapshot["strong_save"]
+basic_time, strong_time = snapshot["basic_time"], snapshot["strong_time"]
+
+# ========================= PERSISTENCE =========================
+# Queued writes (batched into one transaction by the store), only when something changed
+persisted = (profile_id, profile)
+if st.session_state.get("persisted") != persisted:
+    st.session_state["persisted"] = persisted
+    store.save_profile(profile_id, **profile.as_dict())
+    if profile.goal_name:
+        store.save_goal(profile_id, profile.goal_name, profile.goal_amount, profile.goal_date)
+    store.record_snapshot(profile_id, date.today(), net_worth=net_worth, monthly_save=monthly_save,
+                          goal_amount=profile.goal_amount, goal_progress=goal_progress,
+                          months_needed=months_needed if months_needed != "N/A" else None)
+metrics.lap("calculations")
 
 # ========================= HEADER + NAV (WORKING) =========================
 st.markdown("<h1 class='app-title'>Your Personal Financial Advisor — Smart AI</h1>", unsafe_allow_html=True)
 st.markdown(f"<p style='text-align:center; color:#E0E7FF; font-size:22px; margin-top:-10px;'>Today {datetime.now().strftime('%d %B %Y')}</p>", unsafe_allow_html=True)
-
-# initialize page state
-if "page" not in st.session_state:
-    st.session_state["page"] = "overview"
-
-# navigation buttons (styled to match original)
-nav1, nav2, nav3 = st.columns([1,1,1])
-with nav1:
-    b1 = st.button("Overview", key="nav_overview")
-    if b1:
-        st.session_state["page"] = "overview"
-with nav2:
-    b2 = st.button("AI Insights", key="nav_insights")
-    if b2:
-        st.session_state["page"] = "insights"
-with nav3:
-    b3 = st.button("Visuals", key="nav_visuals")
-    if b3:
-        st.session_state["page"] = "visuals"
-
-# add active class to the correct button visually by injecting a tiny script that toggles class
-active_page = st.session_state["page"]
-# Apply 'active' styling by adding a tiny bit of CSS that targets the nth button — safe approach
-# (We can't directly add classes to st.button output easily, but this styling keeps visual parity enough.)
-st.markdown(f"""
-<style>
-/* Attempt to highlight the active nav by matching button texts - keeps visual cue */
-button[title="nav_{'overview' if active_page=='overview' else ''}"]{{}}
-</style>
-""", unsafe_allow_html=True)
+metrics.lap("header")
 
 # ---------------- PAGE: OVERVIEW ----------------
-if st.session_state["page"] == "overview":
+EMERGENCY_DEADLINE = 6  # months to build the 3-month emergency fund
+DEBT_DEADLINE = 24  # months to clear existing debt
+BACKGROUND_TIMEOUT = 15  # seconds the page waits for background results
+EXTRA_GOAL_COLUMNS = {"Goal": "str", "Amount (PKR)": "float64", "Deadline": "datetime64[ns]", "Priority": "float64"}
+
+
+def overview_page():
+    # Slow work (simulation, model inference) runs on the shared executor; its
+    # sections render placeholders now and are filled in at the end of the page
+    executor = get_executor()
+    today = date.today()
+    months_to_deadline = max(0, (profile.goal_date.year - today.year) * 12 + profile.goal_date.month - today.month)
+    eta_future = executor.submit(goal_eta, profile.monthly_income, profile.monthly_expenses, profile.current_savings,
+                                 profile.goal_amount, months_to_deadline)
+    prediction_future = None
+    if predictor.model_available():
+        prediction_future = executor.submit(predictor.predict_finance, profile.monthly_income, profile.monthly_expenses, monthly_save)
+
     # ========================= OVERVIEW SECTION (same as before) =========================
     st.markdown("<h3 id='overview' style='text-align:center; color:white; margin:center; margin:40px 0 30px;'>Overview — Quick Snapshot</h3>", unsafe_allow_html=True)
     cols = st.columns(5)
     for col, (label, val) in zip(cols, [
         ("Total Amount", total_amount),
-        ("Monthly Income", monthly_income),
-        ("Monthly Expenses", monthly_expenses),
-        ("Total Savings", current_savings),
+        ("Monthly Income", profile.monthly_income),
+        ("Monthly Expenses", profile.monthly_expenses),
+        ("Total Savings", profile.current_savings),
         ("Net Worth", net_worth)
     ]):
         col.markdown(f"""
@@ -265,14 +307,21 @@ if st.session_state["page"] == "overview":
         """, unsafe_allow_html=True)
 
     st.markdown("<br><br>", unsafe_allow_html=True)
+    metrics.lap("cards")
 
     # ========================= GOAL SECTION =========================
     st.markdown("<h3 style='text-align:center; color:white; margin-bottom:30px;'>Goal Progress & Smart Plans</h3>", unsafe_allow_html=True)
 
-    st.markdown(f"""
+    goal_history = store.goal_history(profile_id)
+    history_text = ""
+    if len(goal_history) > 1:
+        first = goal_history[0]
+        history_text = f"Since {first['date']}: {first['goal_progress']:.1f}% → {goal_progress:.1f}%"
+    def goal_box(simulated):
+        return f"""
     <div class='goal-box'>
         <div style='font-size:24px; font-weight:800; color:white; margin-bottom:16px;'>
-            {goal_name} → Target: Rs {goal_amount:,}
+            {profile.goal_name} → Target: Rs {profile.goal_amount:,}
         </div>
         <div class='goal-bar'>
             <div class='goal-fill' style='width:{goal_progress}%'></div>
@@ -280,13 +329,21 @@ if st.session_state["page"] == "overview":
         <div style='color:#E0E7FF; font-size:18px; font-weight:600; margin:16px 0;'>
             {goal_progress:.1f}% Complete • Current ETA: {months_needed} months
         </div>
+        <div style='color:#E0E7FF; font-size:16px; margin:8px 0;'>
+            {simulated}
+        </div>
+        <div style='color:#E0E7FF; font-size:15px; margin:8px 0;'>{history_text}</div>
         <div class='rec-message {rec_color}'>
             {rec_msg}
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+    goal_slot = st.empty()
+    goal_slot.markdown(goal_box("Simulating ETA…"), unsafe_allow_html=True)
 
     st.markdown("<br><br>", unsafe_allow_html=True)
+    metrics.lap("goal")
 
     # ========================= SMART PLANS =========================
     if show_plans:
@@ -310,58 +367,148 @@ if st.session_state["page"] == "overview":
             """, unsafe_allow_html=True)
 
     st.markdown("<br><br>", unsafe_allow_html=True)
+    metrics.lap("plans")
+
+    # ========================= MULTIPLE GOALS (monthly split) =========================
+    st.markdown("<h4 style='text-align:center; color:white;'>Multiple Goals — Monthly Savings Split</h4>", unsafe_allow_html=True)
+    goals = []
+    if snapshot["shortfall"] > 0:
+        goals.append(Goal("Emergency Fund (3 months)", snapshot["shortfall"], EMERGENCY_DEADLINE, 1))
+    if profile.total_debt > 0:
+        goals.append(Goal("Debt Payoff", profile.total_debt, DEBT_DEADLINE, 2))
+    if remaining > 0:
+        goals.append(Goal(profile.goal_name or "Main Goal", remaining, months_until(profile.goal_date, today), 2))
+
+    import pandas as pd
+
+    extra_goals = st.data_editor(
+        pd.DataFrame({c: pd.Series(dtype=t) for c, t in EXTRA_GOAL_COLUMNS.items()}), num_rows="dynamic", use_container_width=True, key="extra_goals",
+        column_config={
+            "Amount (PKR)": st.column_config.NumberColumn(min_value=0, step=10000, format="%d"),
+            "Deadline": st.column_config.DateColumn(min_value=today),
+            "Priority": st.column_config.NumberColumn(min_value=1, max_value=5, step=1, help="1 = sabse zaroori"),
+        },
+    )
+    complete = extra_goals.dropna(subset=["Goal", "Amount (PKR)", "Deadline"])
+    for name, amount, deadline, priority in complete.itertuples(index=False):
+        if str(name).strip() and amount > 0:
+            goals.append(Goal(str(name).strip(), float(amount), months_until(pd.Timestamp(deadline).date(), today),
+                              3 if pd.isna(priority) else int(priority)))
+
+    if goals and monthly_save > 0:
+        plan = allocate(goals, monthly_save)
+        st.dataframe({
+            "Goal": [g.name for g in plan.goals],
+            "Needed (Rs)": [f"{g.amount:,.0f}" for g in plan.goals],
+            "Deadline": [f"{g.deadline} months" for g in plan.goals],
+            "Funded in": [f"{f:.0f} months" if f == f else "30+ years" for f in plan.finish],
+            "This Month (Rs)": [f"{m:,.0f}" for m in plan.schedule[:, 0]],
+            "Status": ["✅ On time" if ok else "⚠️ Late" for ok in plan.on_time],
+        }, use_container_width=True, hide_index=True)
+        missed = len(goals) - int(plan.on_time.sum())
+        st.caption(f"Rs {monthly_save:,}/month split by deadline — {missed} of {len(goals)} goals late" if missed
+                   else f"Rs {monthly_save:,}/month split by deadline — sab goals time par!")
+        st.plotly_chart(charts.goal_allocation(tuple(goals), monthly_save), use_container_width=True)
+    elif goals:
+        st.caption("Abhi monthly saving 0 hai — expenses kam karein to goals fund ho sakein.")
+    metrics.lap("goals")
+
+    # ========================= AI SAVINGS PREDICTION =========================
+    st.markdown("<h3 style='text-align:center; color:white;'>AI Savings Prediction</h3>", unsafe_allow_html=True)
+    prediction_labels = ["Next Month", "Next 3 Months (avg)", "Next 6 Months (avg)", "Financial Health"]
+    if prediction_future is not None:
+        prediction_slots = [col.empty() for col in st.columns(4)]
+        for slot, label in zip(prediction_slots, prediction_labels):
+            slot.markdown(f"""
+            <div class='plan-card'>
+                <b>{label}</b><br>
+                <span style='font-size:24px; font-weight:900;'>…</span>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.caption("Model files not found — run the notebook to create finance_model.joblib and scaler.joblib.")
+
+    st.markdown("<br><br>", unsafe_allow_html=True)
+    metrics.lap("prediction")
 
     # ========================= FINAL CHART (100% CLEAR LABELS) =========================
     st.markdown("<h3 style='text-align:center; color:white;'>Financial Overview</h3>", unsafe_allow_html=True)
-    chart_data = pd.DataFrame({
-        "Category": ["Income", "Expenses", "Savings", "Investments"],
-        "Amount": [monthly_income, monthly_expenses, current_savings, current_investments]
-    })
-    fig = px.bar(chart_data, x="Category", y="Amount", color="Category",
-                 text=chart_data["Amount"].apply(lambda x: f"Rs {x:,}"),
-                 color_discrete_sequence=["#8b5cf6", "#ef4444", "#10b981", "#f59e0b"])
-    fig.update_traces(textposition='outside', textfont_size=20, textfont_color="pink")
-    fig.update_layout(
-        showlegend=False, plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-        height=500, font=dict(color="pink", size=20),
-        yaxis=dict(showgrid=False, title="Amount (PKR)", color="pink"),
-        xaxis=dict(color="pink")
-    )
+    fig = charts.overview_bar(profile.monthly_income, profile.monthly_expenses, profile.current_savings, profile.current_investments)
     st.plotly_chart(fig, use_container_width=True)
+    metrics.lap("chart:overview_bar")
+
+    # ========================= PDF REPORT =========================
+    def pdf_report():
+        # Runs only when the button is clicked (deferred download)
+        from advisor.report import build_report
+
+        return build_report(profile.columns(), profile.goal_name)
+
+    st.download_button("📄 Download PDF Report", data=pdf_report, file_name="financial_report.pdf",
+                       mime="application/pdf", on_click="ignore", use_container_width=True)
 
     st.markdown("---")
     st.caption("© 2025 Your Personal Financial Advisor - Made with Abdul-Hanan in Pakistan")
 
+    # ========================= FILL IN BACKGROUND RESULTS =========================
+    # One shared deadline so a stuck job can't hold the page for long; the job keeps
+    # running in the pool and the next rerun picks up its result
+    deadline = time.monotonic() + BACKGROUND_TIMEOUT
+
+    # Monte Carlo ETA over income/expense volatility (P10 / P50 / P90 months)
+    try:
+        eta = eta_future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except TimeoutError:
+        goal_slot.markdown(goal_box("ETA simulation abhi chal rahi hai — page refresh karein."),
+                           unsafe_allow_html=True)
+    else:
+        eta_text = " / ".join(
+            f"{eta[q]:.0f}" if eta[q] != float("inf") else f"{eta['horizon']}+" for q in ("p10", "p50", "p90")
+        )
+        goal_slot.markdown(goal_box(
+            f"Simulated ETA (P10 / P50 / P90): {eta_text} months • "
+            f"Chance by {profile.goal_date.strftime('%b %Y')}: <b>{eta['prob_by']:.0%}</b>"
+        ), unsafe_allow_html=True)
+
+    if prediction_future is not None:
+        try:
+            prediction = prediction_future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except TimeoutError:
+            values = ["Refresh karein"] * len(prediction_labels)
+        else:
+            values = [f"Rs {prediction[k]:,.0f}" for k in ("next_month", "next_3_months", "next_6_months")]
+            values.append(prediction["health"])
+        for slot, label, val in zip(prediction_slots, prediction_labels, values):
+            slot.markdown(f"""
+            <div class='plan-card'>
+                <b>{label}</b><br>
+                <span style='font-size:24px; font-weight:900;'>{val}</span>
+            </div>
+            """, unsafe_allow_html=True)
+    metrics.lap("background")
+
 # ---------------- PAGE: INSIGHTS ----------------
-elif st.session_state["page"] == "insights":
+def insights_page():
+
+    from advisor.cohorts import get_cohort_index
+    from advisor.features import profile_features
 
     # Page Title
     st.markdown("<h2 style='text-align:center; color:#6CE0AC; margin-bottom:0;'>Modern Insights</h2>", unsafe_allow_html=True)
     st.markdown("<p style='text-align:center; color:#dbeafe; margin-top:-8px; font-size:17px;'>Emergency readiness overview</p>", unsafe_allow_html=True)
 
-    # Calculations
-    required = monthly_expenses * 3
-    ideal_required = monthly_expenses * 6
-    raw_progress = (current_savings / required * 100) if required > 0 else 0
-    progress = min(max(raw_progress, 0), 100)
-    months_covered = current_savings / monthly_expenses if monthly_expenses > 0 else 0
-    shortfall = max(0, required - current_savings)
-
-    # Gauge Logic + suggestion text (ensure suggestion is always defined)
-    if progress < 50:
-        gauge_color = "#ef4444"
-        text_status = "Low"
-        suggestion = "Emergency fund BOHOT kam hai — start saving 20% monthly or create a separate emergency account."
-    elif progress < 80:
-        gauge_color = "#f59e0b"
-        text_status = "Fair"
-        suggestion = "Acha progress! Set an auto-transfer to your emergency fund each month."
-    else:
-        gauge_color = "#10b981"
-        text_status = "Good"
-        suggestion = "Shabash! Emergency fund nearly / fully complete — keep it isolated for real emergencies."
+    # Calculations (shared snapshot engine)
+    required = snapshot["required"]
+    ideal_required = snapshot["ideal_required"]
+    progress = snapshot["emergency_progress"]
+    months_covered = snapshot["months_covered"]
+    shortfall = snapshot["shortfall"]
 
-    angle = progress * 3.6
+    # Gauge Logic + suggestion text
+    gauge_color = snapshot["gauge_color"]
+    text_status = snapshot["gauge_status"]
+    suggestion = snapshot["suggestion"]
+    angle = snapshot["angle"]
 
     # ---------- Gauge Card ----------
     st.markdown(f"""
@@ -401,7 +548,7 @@ elif st.session_state["page"] == "insights":
     <div style="background:rgba(255,255,255,0.08); padding:16px; border-radius:14px;
                 border:1px solid rgba(255,255,255,0.10); text-align:center;">
         <div style='color:#b6d8ff; font-size:14px;'>Monthly Expenses</div>
-        <div style='color:white; font-size:22px; font-weight:800;'>Rs {monthly_expenses:,}</div>
+        <div style='color:white; font-size:22px; font-weight:800;'>Rs {profile.monthly_expenses:,}</div>
     </div>
     """, unsafe_allow_html=True)
 
@@ -469,7 +616,7 @@ elif st.session_state["page"] == "insights":
         <div class='quick-box'>
             <span class='quick-icon'>💰</span>
             <span class='quick-title'>Saving</span>
-            <div class='quick-sub'>{'Positive flow' if monthly_income>monthly_expenses else 'Negative flow'}</div>
+            <div class='quick-sub'>{'Positive flow' if snapshot['positive_flow'] else 'Negative flow'}</div>
         </div>
     """, unsafe_allow_html=True)
 
@@ -485,85 +632,86 @@ elif st.session_state["page"] == "insights":
         <div class='quick-box'>
             <span class='quick-icon'>📉</span>
             <span class='quick-title'>Debt</span>
-            <div class='quick-sub'>{'No debt' if total_debt==0 else f'Rs {total_debt:,}'}</div>
+            <div class='quick-sub'>{'No debt' if profile.total_debt==0 else f'Rs {profile.total_debt:,}'}</div>
         </div>
     """, unsafe_allow_html=True)
 
     st.markdown("<br><br>", unsafe_allow_html=True)
 
+    # ---------- How You Compare (cohort percentiles) ----------
+    st.markdown(f"<h4 style='text-align:center; color:white;'>How You Compare — {profile.income_type} earners</h4>", unsafe_allow_html=True)
+    # Same feature definitions the cohort sketches were built from
+    features = {k: 0.0 if v != v else v
+                for k, v in profile_features(profile.monthly_income, profile.monthly_expenses, profile.current_savings).items()}
+    savings_rate, expense_ratio = features["savings_rate"], features["expense_ratio"]
+    comparison = get_cohort_index().compare((profile.income_type,), **features)
+    k1, k2, k3 = st.columns(3)
+    for col, (label, metric, val) in zip([k1, k2, k3], [
+        ("Savings Rate", "savings_rate", f"{savings_rate:.0%}"),
+        ("Expense Ratio", "expense_ratio", f"{expense_ratio:.0%}"),
+        ("Emergency Coverage", "emergency_months", f"{months_covered:.1f} months"),
+    ]):
+        col.markdown(f"""
+        <div class='quick-box'>
+            <span class='quick-title'>{label}: {val}</span>
+            <div class='quick-sub'>Better than {comparison[metric]["better_than"]:.0f}% of {comparison["size"]:,} peers</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("<br><br>", unsafe_allow_html=True)
+    metrics.lap("cards")
+
 
 
 # ---------------- PAGE: VISUALS ----------------
-elif st.session_state["page"] == "visuals":
+def visuals_page():
 
-    import plotly.express as px
-    import plotly.graph_objects as go
-    import pandas as pd
-    import numpy as np
+    from advisor.users import get_user_index
 
     st.markdown("<h2 class='neon-title' style='text-align:center;'>Advanced Financial Visuals</h2>", unsafe_allow_html=True)
     st.markdown("<p style='text-align:center; margin-top:-10px;'>Breakdowns | Trend | Goal </p>", unsafe_allow_html=True)
 
     # ---------- DATA PREP ----------
-    categories = ["Food", "Transport", "Bills", "Shopping", "Other"]
-    spending = [
-        monthly_expenses * 0.25,
-        monthly_expenses * 0.15,
-        monthly_expenses * 0.30,
-        monthly_expenses * 0.20,
-        monthly_expenses * 0.10,
-    ]
-    df = pd.DataFrame({"Category": categories, "Amount": spending})
-
-    # Monthly trend
-    trend_months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun"]
-    df_trend = pd.DataFrame({
-        "Month": trend_months,
-        "Income": np.random.randint(monthly_income*0.8, monthly_income*1.1, 6),
-        "Expenses": np.random.randint(monthly_expenses*0.9, monthly_expenses*1.2, 6)
-    })
-
-    # Heatmap Data
-    heatmap_data = np.random.randint(2000, 9000, (6, 5))
+    if statement and statement["categories"]:
+        # Real category shares from the imported statement
+        total_spend = sum(statement["categories"].values())
+        categories = list(statement["categories"])
+        spending = [profile.monthly_expenses * amount / total_spend for amount in statement["categories"].values()]
+    else:
+        categories = ["Food", "Transport", "Bills", "Shopping", "Other"]
+        spending = [
+            profile.monthly_expenses * 0.25,
+            profile.monthly_expenses * 0.15,
+            profile.monthly_expenses * 0.30,
+            profile.monthly_expenses * 0.20,
+            profile.monthly_expenses * 0.10,
+        ]
+
+    # Monthly trend: the imported statement if any, else one dataset user's history
+    if statement and statement["months"]:
+        trend = (tuple(statement["months"]), tuple(statement["monthly_income_series"]),
+                 tuple(statement["monthly_expense_series"]))
+    else:
+        user_index = get_user_index()
+        user_ids = user_index.user_ids.tolist()
+        trend_user = st.selectbox("Trend for dataset user_id", user_ids,
+                                  index=user_ids.index(user_index.busiest_user()), key="trend_user")
+        history = user_index.history(trend_user)
+        trend = (tuple(history["date"]), tuple(history["monthly_income"]), tuple(history["monthly_expense_total"]))
+    metrics.lap("data")
 
     # ---------- ROW 1: Pie Chart (Animated) ----------
-    fig_pie = px.pie(df, names="Category", values="Amount",
-                     color_discrete_sequence=px.colors.sequential.Purples)
-    fig_pie.update_traces(textinfo="percent+label", pull=0.08)
-    fig_pie.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        font_color='white',
-        legend=dict(orientation="h", y=-0.15)
-    )
+    fig_pie = charts.spending_pie(tuple(categories), tuple(spending))
 
     st.markdown("<div class='neon-card fade'>", unsafe_allow_html=True)
     st.subheader("💠 Spending Breakdown")
     st.plotly_chart(fig_pie, use_container_width=True)
     st.markdown("</div><br>", unsafe_allow_html=True)
+    metrics.lap("chart:spending_pie")
 
     # ---------- ROW 2: Line Chart (Animated Smooth Curve) ----------
-    fig_line = go.Figure()
-    fig_line.add_trace(go.Scatter(
-        x=df_trend["Month"],
-        y=df_trend["Income"],
-        mode="lines+markers",
-        name="Income",
-        line=dict(color="#10b981", width=4),
-    ))
-    fig_line.add_trace(go.Scatter(
-        x=df_trend["Month"],
-        y=df_trend["Expenses"],
-        mode="lines+markers",
-        name="Expenses",
-        line=dict(color="#ef4444", width=4),
-    ))
-    fig_line.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(255,255,255,0.05)",
-        font_color="white",
-        xaxis_title=None,
-        yaxis_title=None
-    )
+    # Long histories are LTTB-downsampled (and WebGL-drawn) inside the builder
+    fig_line = charts.trend_line(*trend)
 
     a, b = st.columns(2)
 
@@ -572,30 +720,147 @@ elif st.session_state["page"] == "visuals":
         st.subheader("📊 Monthly Trend")
         st.plotly_chart(fig_line, use_container_width=True)
         st.markdown("</div>", unsafe_allow_html=True)
+    metrics.lap("chart:trend_line")
 
     # ---------- ROW 2 (Right): Circular Gauge ----------
-    goal_figure = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=goal_progress,
-        gauge={
-            "axis": {"range": [0, 100]},
-            "bar": {"color": "#8b5cf6"},
-            "bgcolor": "rgba(255,255,255,0.07)",
-            "borderwidth": 2,
-            "bordercolor": "white",
-        },
-        number={'suffix': "%"},
-        domain={"x": [0, 1], "y": [0, 1]}
-    ))
-    goal_figure.update_layout(paper_bgcolor="rgba(0,0,0,0)", font_color="white")
+    goal_figure = charts.goal_gauge(goal_progress)
 
     with b:
         st.markdown("<div class='neon-card fade'>", unsafe_allow_html=True)
         st.subheader("🎯 Goal Completion")
         st.plotly_chart(goal_figure, use_container_width=True)
         st.markdown("</div>", unsafe_allow_html=True)
+    metrics.lap("chart:goal_gauge")
+
+    # ---------- ROW 3: What-if Heatmap (expense cut x income growth) ----------
+    today = date.today()
+    horizon = max(12, (profile.goal_date.year - today.year) * 12 + profile.goal_date.month - today.month)
+    st.markdown("<div class='neon-card fade'>", unsafe_allow_html=True)
+    st.subheader("🧪 What-if: Expense Cut × Income Growth")
+    whatif_labels = {"months_to_goal": "Months to goal", "net_worth": f"Net worth in {horizon} months"}
+    whatif_metric = st.radio("Show", list(whatif_labels), format_func=whatif_labels.get,
+                             horizontal=True, key="whatif_metric")
+    fig_whatif = charts.whatif_heatmap(
+        whatif_metric,
+        profile.monthly_income, profile.monthly_expenses, profile.current_savings,
+        net_worth, profile.goal_amount, horizon,
+    )
+    st.plotly_chart(fig_whatif, use_container_width=True)
+    st.caption("Har cell: expenses itne % kam + income har saal itni % barhe. Blank = 30 saal mein bhi goal nahi.")
+    st.markdown("</div>", unsafe_allow_html=True)
+    metrics.lap("chart:whatif_heatmap")
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+
+# ---------------- PAGE: ALERTS ----------------
+ALERTS_SHOWN = 25
+
+
+def alerts_page():
+
+    from advisor.anomaly import dataset_alerts
+
+    st.markdown("<h2 style='text-align:center; color:#6CE0AC; margin-bottom:0;'>Transaction Alerts</h2>", unsafe_allow_html=True)
+    st.markdown("<p style='text-align:center; color:#dbeafe; margin-top:-8px; font-size:17px;'>Rows that break from the user's own spending pattern</p>", unsafe_allow_html=True)
+
+    # Streaming scorer over the whole dataset (memoized per process)
+    alerts, stats = dataset_alerts()
+
+    s1, s2, s3, s4 = st.columns(4)
+    for col, (label, val) in zip([s1, s2, s3, s4], [
+        ("Rows Scanned", f"{stats['rows']:,}"),
+        ("Alerts", f"{stats['flagged']:,}"),
+        ("Also fraud_flag", f"{stats['flagged_fraud']:,}"),
+        ("Rows / sec", f"{stats['rows_per_sec']:,.0f}"),
+    ]):
+        col.markdown(f"""
+        <div style="background:rgba(255,255,255,0.08); padding:16px; border-radius:14px;
+                    border:1px solid rgba(255,255,255,0.10); text-align:center;">
+            <div style='color:#b6d8ff; font-size:14px;'>{label}</div>
+            <div style='color:white; font-size:22px; font-weight:800;'>{val}</div>
+        </div>
+        """, unsafe_allow_html=True)
 
     st.markdown("<br>", unsafe_allow_html=True)
+    metrics.lap("cards")
+
+    # ---------- Top Alerts ----------
+    st.subheader("🚨 Top Alerts")
+    st.dataframe([
+        {
+            "Date": a.date,
+            "User": a.user_id,
+            "Feature": a.feature,
+            "Value": round(a.value, 2),
+            "Expected": round(a.expected, 2),
+            "Score (z)": round(a.score, 1),
+            "fraud_flag": a.fraud_flag,
+        }
+        for a in alerts[:ALERTS_SHOWN]
+    ], use_container_width=True, hide_index=True)
+    metrics.lap("table")
+
+
+# ========================= PAGE ROUTER =========================
+PAGES = {"overview": overview_page, "insights": insights_page, "visuals": visuals_page, "alerts": alerts_page}
+
+
+@st.fragment
+def render_page():
+    # Nav clicks and page-local widgets rerun only this fragment, not the
+    # whole script (CSS, sidebar and calculations stay as they are).
+
+    # initialize page state
+    if "page" not in st.session_state:
+        st.session_state["page"] = "overview"
+
+    # A fragment-only rerun skips the top of the script, so it gets its own timeline
+    fragment_run = metrics.ENABLED and metrics.current() is None
+    if fragment_run:
+        metrics.begin(st.session_state["page"])
+
+    # navigation buttons (styled to match original)
+    nav1, nav2, nav3, nav4 = st.columns([1,1,1,1])
+    with nav1:
+        b1 = st.button("Overview", key="nav_overview")
+        if b1:
+            st.session_state["page"] = "overview"
+    with nav2:
+        b2 = st.button("AI Insights", key="nav_insights")
+        if b2:
+            st.session_state["page"] = "insights"
+    with nav3:
+        b3 = st.button("Visuals", key="nav_visuals")
+        if b3:
+            st.session_state["page"] = "visuals"
+    with nav4:
+        b4 = st.button("Alerts", key="nav_alerts")
+        if b4:
+            st.session_state["page"] = "alerts"
+
+    # add active class to the correct button visually by injecting a tiny script that toggles class
+    active_page = st.session_state["page"]
+    # Apply 'active' styling by adding a tiny bit of CSS that targets the nth button — safe approach
+    # (We can't directly add classes to st.button output easily, but this styling keeps visual parity enough.)
+    st.markdown(f"""
+    <style>
+    /* Attempt to highlight the active nav by matching button texts - keeps visual cue */
+    button[title="nav_{'overview' if active_page=='overview' else ''}"]{{}}
+    </style>
+    """, unsafe_allow_html=True)
+
+    metrics.label(st.session_state["page"])
+    metrics.lap("nav")
+    PAGES[st.session_state["page"]]()
+    metrics.lap("other")
+    if fragment_run:
+        st.session_state["perf_last"] = metrics.finish()
+
+
+render_page()
+if metrics.ENABLED:
+    st.session_state["perf_last"] = metrics.finish()
 # ========================= END =========================
 
 
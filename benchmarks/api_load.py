@@ -0,0 +1,118 @@
+"""Load test for the JSON advice API.
+
+    python benchmarks/api_load.py [--url http://127.0.0.1:8502] [--levels 1 8 32]
+
+Without --url a server is started in a subprocess on a free port (so the
+load generator does not share its GIL). Each concurrency level runs
+``--requests`` calls spread over that many threads, each thread on its own
+keep-alive connection, against the single and the bulk endpoint, and
+prints p50/p99 latency and requests per second.
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILE = {
+    "monthly_income": 100000, "monthly_expenses": 60000, "current_savings": 250000,
+    "total_debt": 50000, "current_investments": 100000, "goal_amount": 2000000,
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server():
+    port = _free_port()
+    proc = subprocess.Popen([sys.executable, "-m", "advisor.api", "--port", str(port)], cwd=ROOT,
+                            stdout=subprocess.PIPE, text=True)
+    proc.stdout.readline()  # "Listening on ..."
+    return proc, f"http://127.0.0.1:{port}"
+
+
+def _worker(host, port, path, body, count, samples, errors):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            conn.request("POST", path, body, headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as exc:
+            errors.append(str(exc))
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+        samples.append((time.perf_counter() - start) * 1000)
+    conn.close()
+
+
+def run_level(url, path, body, concurrency, requests):
+    parsed = urlparse(url)
+    samples, errors = [], []
+    per_thread = max(requests // concurrency, 1)
+    threads = [threading.Thread(target=_worker,
+                                args=(parsed.hostname, parsed.port, path, body, per_thread, samples, errors))
+               for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    return {
+        "p50_ms": statistics.median(samples),
+        "p99_ms": samples[min(int(len(samples) * 0.99), len(samples) - 1)],
+        "rps": len(samples) / elapsed,
+        "errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="existing server (default: start one)")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per level")
+    parser.add_argument("--bulk-size", type=int, default=100)
+    args = parser.parse_args()
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = _start_server()
+    try:
+        cases = (
+            ("single", "/v1/advice", json.dumps(PROFILE).encode()),
+            (f"bulk x{args.bulk_size}", "/v1/advice/bulk",
+             json.dumps({"profiles": [PROFILE] * args.bulk_size}).encode()),
+        )
+        print(f"{'endpoint':<12} {'conc':>5} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>7}")
+        for name, path, body in cases:
+            run_level(url, path, body, 1, 50)  # warm-up
+            for level in args.levels:
+                r = run_level(url, path, body, level, args.requests)
+                print(f"{name:<12} {level:>5} {r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f} "
+                      f"{r['rps']:>9.0f} {r['errors']:>7}")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
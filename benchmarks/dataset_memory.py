@@ -0,0 +1,49 @@
+"""Dataset memory: bytes per row before and after the compact shared frame.
+
+    python benchmarks/dataset_memory.py [--sessions 50]
+
+"Before" is a plain ``pd.read_csv`` of the dataset (float64/int64 numbers,
+Python strings), i.e. what each session held when it loaded its own copy.
+"After" is ``advisor.data.get_dataset()``. The second table is what
+``--sessions`` simulated sessions add on top when each takes the column
+views the app pages use.
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from advisor.data import dataset_view, get_dataset, memory_report  # noqa: E402
+from advisor.users import HISTORY_COLUMNS  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    args = parser.parse_args()
+
+    report = memory_report()
+    with pd.option_context("display.width", 120, "display.max_rows", None, "display.max_columns", None,
+                           "display.precision", 1):
+        print(report)
+    before, after = report["bytes_per_row_before"].sum(), report["bytes_per_row_after"].sum()
+    rows = len(get_dataset())
+    print(f"\nbytes/row:  {before:.1f} -> {after:.1f}  ({before / after:.1f}x smaller)")
+    print(f"whole frame: {before * rows / 1e6:.2f} MB -> {after * rows / 1e6:.2f} MB")
+
+    tracemalloc.start()
+    views = [dataset_view(("user_id",) + HISTORY_COLUMNS) for _ in range(args.sessions)]
+    added, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"\n{args.sessions} session views: {added / 1e3:.1f} KB total "
+          f"(vs {before * rows * args.sessions / 1e6:.1f} MB for per-session read_csv copies)")
+    del views
+
+
+if __name__ == "__main__":
+    main()
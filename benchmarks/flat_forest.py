@@ -0,0 +1,116 @@
+"""Joblib forest vs. flattened array forest: load time, memory and latency.
+
+    python benchmarks/flat_forest.py [--model PATH] [--scaler PATH] [--rows 10000]
+
+Load time is measured in a fresh interpreter (so sklearn's import is part of
+the joblib cost, as on a cold app start). Memory is the resident-set growth
+caused by loading the artifacts once their libraries are imported (Linux
+/proc). Predictions are checked against sklearn first.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from advisor.flatforest import FlatForest, FlatScaler, save_forest  # noqa: E402
+from advisor.predictor import artifact_paths  # noqa: E402
+
+_RSS = """
+import os
+def rss():
+    with open("/proc/self/statm") as fh:
+        return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+"""
+_LOAD_JOBLIB = _RSS + """
+import time
+t = time.perf_counter()
+import joblib, sklearn.ensemble
+base = rss()
+objs = joblib.load({model!r}), joblib.load({scaler!r})
+print((time.perf_counter() - t) * 1000, rss() - base)
+"""
+_LOAD_FLAT = _RSS + """
+import time
+t = time.perf_counter()
+from advisor.flatforest import FlatForest, FlatScaler
+base = rss()
+objs = FlatForest.load({forest!r}), FlatScaler.load({forest!r})
+print((time.perf_counter() - t) * 1000, rss() - base)
+"""
+
+
+def _cold(code, repeat=3):
+    """Median (load ms, RSS growth bytes) over fresh interpreters."""
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        ms, rss = out.stdout.strip().splitlines()[-1].split()
+        runs.append((float(ms), int(rss)))
+    return float(np.median([r[0] for r in runs])), int(np.median([r[1] for r in runs]))
+
+
+def _per_row_us(predict, X, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        predict(X)
+    return (time.perf_counter() - start) / repeat / len(X) * 1e6
+
+
+def main():
+    default_model, default_scaler = artifact_paths()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=default_model)
+    parser.add_argument("--scaler", default=default_scaler)
+    parser.add_argument("--rows", type=int, default=10000, help="batch size for the batch latency")
+    args = parser.parse_args()
+
+    import joblib
+    import pandas as pd
+
+    with tempfile.TemporaryDirectory() as tmp:
+        forest_path = os.path.join(tmp, "forest.npz")
+        model, scaler = joblib.load(args.model), joblib.load(args.scaler)
+        save_forest(forest_path, model, scaler)
+        forest, flat_scaler = FlatForest.load(forest_path), FlatScaler.load(forest_path)
+        sk_load_ms, sk_rss = _cold(_LOAD_JOBLIB.format(model=args.model, scaler=args.scaler))
+        flat_load_ms, flat_rss = _cold(_LOAD_FLAT.format(forest=forest_path))
+
+        rng = np.random.default_rng(0)
+        X = rng.normal(scaler.mean_, scaler.scale_, size=(args.rows, len(scaler.mean_)))
+        frame = pd.DataFrame(X, columns=getattr(scaler, "feature_names_in_", None))
+
+        def sk_predict(rows):
+            return model.predict(scaler.transform(rows))
+
+        def flat_predict(rows):
+            return forest.predict(flat_scaler.transform(rows))
+
+        max_err = float(np.abs(sk_predict(frame) - flat_predict(X)).max())
+
+        results = {
+            "max_abs_error": max_err,
+            "file_bytes": {"joblib": os.path.getsize(args.model) + os.path.getsize(args.scaler),
+                           "flat": os.path.getsize(forest_path)},
+            "loaded_rss_bytes": {"joblib": sk_rss, "flat": flat_rss},
+            "cold_load_ms": {"joblib": sk_load_ms, "flat": flat_load_ms},
+            "single_row_us": {"joblib": _per_row_us(sk_predict, frame.iloc[:1], 50),
+                              "flat": _per_row_us(flat_predict, X[:1], 2000)},
+            "batch_per_row_us": {"joblib": _per_row_us(sk_predict, frame, 3),
+                                 "flat": _per_row_us(flat_predict, X, 3)},
+        }
+
+    print(json.dumps(results, indent=2))
+    if max_err > 1e-9:
+        sys.exit(f"Flat forest diverges from sklearn by {max_err}")
+
+
+if __name__ == "__main__":
+    main()
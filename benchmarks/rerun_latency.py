@@ -0,0 +1,151 @@
+"""Rerun latency of app.py, measured headlessly with Streamlit's AppTest.
+
+    python benchmarks/rerun_latency.py [--repeat 20]
+
+Each scenario replays one user interaction and reports the median and p90
+wall time of the resulting rerun in milliseconds. Nav clicks and page-local
+controls are also measured as fragment-scoped reruns, which is what the
+Streamlit server does for widgets inside an ``st.fragment``.
+
+AppTest has no public way to rerun a single fragment, so those scenarios
+patch two Streamlit internals. They are reported as skipped (never timed
+as full reruns) when those internals are missing or when a probe rerun
+still executes the top of app.py.
+"""
+import argparse
+import contextlib
+import dataclasses
+import functools
+import os
+import statistics
+import time
+
+import streamlit
+from streamlit.testing.v1 import AppTest
+import streamlit.testing.v1.local_script_runner as local_script_runner
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def fragment_support(at):
+    """None if fragment-scoped reruns can be simulated, else why not."""
+    fragments = getattr(getattr(at, "_fragment_storage", None), "_fragments", None)
+    if not isinstance(fragments, dict):
+        return f"AppTest._fragment_storage._fragments not found (streamlit {streamlit.__version__})"
+    rerun_data = getattr(local_script_runner, "RerunData", None)
+    fields = {f.name for f in dataclasses.fields(rerun_data)} if dataclasses.is_dataclass(rerun_data) else set()
+    if not {"fragment_id_queue", "is_fragment_scoped_rerun"} <= fields:
+        return f"RerunData has no fragment fields (streamlit {streamlit.__version__})"
+    if not fragments:
+        return "the app registered no fragment"
+    return None
+
+
+@contextlib.contextmanager
+def full_script_runs():
+    """Count executions of app.py's top level (its st.set_page_config call)."""
+    calls = [0]
+    original = streamlit.set_page_config
+
+    @functools.wraps(original)
+    def counted(*args, **kwargs):
+        calls[0] += 1
+        return original(*args, **kwargs)
+
+    streamlit.set_page_config = counted
+    try:
+        yield calls
+    finally:
+        streamlit.set_page_config = original
+
+
+@contextlib.contextmanager
+def fragment_scoped(at):
+    """Make AppTest reruns behave like a widget event inside the app's fragment.
+
+    AppTest always reruns the whole script, so patch the RerunData it sends
+    with the fragment id registered by the previous run.
+    """
+    fragment_ids = list(at._fragment_storage._fragments)
+    original = local_script_runner.RerunData
+    local_script_runner.RerunData = functools.partial(
+        original, fragment_id_queue=fragment_ids[:1], is_fragment_scoped_rerun=True
+    )
+    try:
+        yield
+    finally:
+        local_script_runner.RerunData = original
+
+
+def scenario_sidebar_edit(at, i):
+    at.number_input[0].set_value(60000 + 1000 * (i % 7))
+    return _timed(at.run)
+
+
+def scenario_nav_click(at, i):
+    page = ("nav_insights", "nav_visuals", "nav_overview")[i % 3]
+    return _timed(at.button(key=page).click().run)
+
+
+def scenario_page_control(at, i):
+    box = at.selectbox(key="trend_user")
+    box.set_value(box.options[i % 5])
+    return _timed(at.run)
+
+
+# name -> (scenario, page to open first, rerun only the page fragment)
+SCENARIOS = {
+    "sidebar_edit": (scenario_sidebar_edit, None, False),
+    "nav_click": (scenario_nav_click, None, False),
+    "page_control": (scenario_page_control, "nav_visuals", False),
+    "nav_click_fragment": (scenario_nav_click, None, True),
+    "page_control_fragment": (scenario_page_control, "nav_visuals", True),
+}
+
+
+def run(repeat):
+    results = {}
+    for name, (scenario, start_page, fragment) in SCENARIOS.items():
+        at = AppTest.from_file(APP, default_timeout=60).run()
+        if start_page:
+            at.button(key=start_page).click().run()
+        if fragment:
+            reason = fragment_support(at)
+            if reason is None:
+                with fragment_scoped(at), full_script_runs() as calls:
+                    scenario(at, repeat)  # probe: must not run the whole script
+                if calls[0]:
+                    reason = "reruns still executed the whole script"
+            if reason is not None:
+                results[name] = {"skipped": reason}
+                continue
+        with fragment_scoped(at) if fragment else contextlib.nullcontext():
+            samples = sorted(scenario(at, i) for i in range(repeat))
+        if at.exception:
+            raise RuntimeError(f"{name}: app raised {at.exception}")
+        results[name] = {
+            "median_ms": statistics.median(samples),
+            "p90_ms": samples[int(0.9 * (len(samples) - 1))],
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    for name, stats in run(args.repeat).items():
+        if "skipped" in stats:
+            print(f"{name:<22} skipped: {stats['skipped']}")
+        else:
+            print(f"{name:<22} median {stats['median_ms']:7.1f} ms   p90 {stats['p90_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
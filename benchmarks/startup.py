@@ -0,0 +1,120 @@
+"""Cold-start benchmark: per-module import cost and time to first Overview render.
+
+    python benchmarks/startup.py [--repeat 3] [--max-first-render-ms 4000]
+
+Every measurement runs in a fresh interpreter so nothing is already cached
+in sys.modules; one untimed render first builds the on-disk caches (dataset,
+features, cohort sketches), as any process after the first would find them.
+The first-render run also lists which heavy dependencies each page pulled
+in. Exits non-zero if a budget is exceeded or if the Insights page loads
+any of HEAVY (it only needs NumPy and the saved caches).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+MODULES = (
+    "streamlit",
+    "numpy",
+    "pandas",
+    "plotly.express",
+    "plotly.graph_objects",
+    "joblib",
+    "sklearn.ensemble",
+    "matplotlib.pyplot",
+    "seaborn",
+    "reportlab.pdfgen.canvas",
+    "fpdf",
+    "advisor.engine",
+    "advisor.charts",
+    "advisor.predictor",
+)
+HEAVY = ("pandas", "plotly", "sklearn", "scipy", "matplotlib", "seaborn", "reportlab", "fpdf")
+
+_IMPORT_SNIPPET = """
+import time
+t = time.perf_counter()
+import {module}
+print((time.perf_counter() - t) * 1000)
+"""
+
+_RENDER_SNIPPET = """
+import json, sys, time
+t = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+before = set(sys.modules)
+{prelude}
+at.run()
+elapsed = (time.perf_counter() - t) * 1000
+loaded = sorted({{m.split(".")[0] for m in set(sys.modules) - before}} & set({heavy!r}))
+print(json.dumps({{"ms": elapsed, "heavy": loaded, "error": bool(at.exception)}}))
+"""
+
+
+def _python(code):
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return out.stdout.strip().splitlines()[-1]
+
+
+def import_times(repeat):
+    return {
+        module: statistics.median(
+            float(_python(_IMPORT_SNIPPET.format(module=module))) for _ in range(repeat)
+        )
+        for module in MODULES
+    }
+
+
+def first_render(page, repeat):
+    # Landing on another page means the session already chose it before the run
+    prelude = "" if page == "overview" else f"at.session_state['page'] = {page!r}"
+    code = _RENDER_SNIPPET.format(app=APP, prelude=prelude, heavy=HEAVY)
+    _python(code)  # warm the on-disk caches
+    runs = [json.loads(_python(code)) for _ in range(repeat)]
+    if any(r["error"] for r in runs):
+        raise RuntimeError(f"{page} page raised during first render")
+    return {"ms": statistics.median(r["ms"] for r in runs),
+            "heavy": sorted({m for r in runs for m in r["heavy"]})}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-first-render-ms", type=float, default=None)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = {"imports_ms": import_times(args.repeat)}
+    print("Import time (fresh interpreter, median):")
+    for module, ms in results["imports_ms"].items():
+        print(f"  {module:<26} {ms:8.1f} ms")
+
+    print("\nFirst render (fresh interpreter, median):")
+    for page in ("overview", "insights"):
+        render = results[f"first_render_{page}"] = first_render(page, args.repeat)
+        print(f"  {page:<26} {render['ms']:8.1f} ms   heavy deps: {', '.join(render['heavy']) or '-'}")
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+    if results["first_render_insights"]["heavy"]:
+        sys.exit(f"Insights first render loaded heavy dependencies: "
+                 f"{', '.join(results['first_render_insights']['heavy'])}")
+    budget = args.max_first_render_ms
+    if budget is not None and results["first_render_overview"]["ms"] > budget:
+        sys.exit(f"Overview first render over budget: "
+                 f"{results['first_render_overview']['ms']:.0f} ms > {budget:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Goal-history query latency on a large snapshot table.
+
+    python benchmarks/store_queries.py [--users 20000] [--months 100]
+
+Fills a scratch SQLite store with users x months snapshot rows (2M by
+default) in one batched write, then times the per-user goal-history query
+the Overview page runs.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from advisor.store import Store  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--months", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Store(os.path.join(tmp, "bench.db"))
+        rows = ((f"user{u}", f"{2000 + m // 12}-{m % 12 + 1:02d}", 1e5, 1e4, 5e6, m / args.months * 100, 120.0)
+                for u in range(args.users) for m in range(args.months))
+        start = time.perf_counter()
+        store.record_snapshots(rows)
+        insert_s = time.perf_counter() - start
+
+        samples = []
+        for i in range(args.queries):
+            start = time.perf_counter()
+            store.goal_history(f"user{(i * 7919) % args.users}")
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        store.close()
+
+    print(f"rows:              {args.users * args.months:,}")
+    print(f"batched insert:    {insert_s:.1f} s")
+    print(f"goal_history p50:  {statistics.median(samples):.3f} ms")
+    print(f"goal_history p99:  {samples[int(len(samples) * 0.99)]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
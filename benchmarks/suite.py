@@ -0,0 +1,199 @@
+"""Headless benchmark suite with regression gating.
+
+    python benchmarks/suite.py [--output results.json] [--baseline old.json] [--threshold 0.25]
+
+Times, in one process:
+  * page reruns (overview / insights / visuals) through Streamlit's AppTest
+  * the snapshot metric calculations (1 profile and 100k profiles), the what-if grid
+    and the multi-goal allocator
+  * CSV load + monthly aggregation, both the notebook way and via the cache
+  * predict_finance-style inference (scale + forest) at batch sizes 1, 1k, 100k
+
+Results are written as JSON (name -> median ms). With --baseline, any
+benchmark slower than baseline * (1 + threshold) is reported and the run
+exits non-zero.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+APP = os.path.join(ROOT, "app.py")
+
+from advisor.data import DATASET_PATH  # noqa: E402
+
+PAGES = ("overview", "insights", "visuals")
+INFERENCE_BATCHES = (1, 1_000, 100_000)
+
+
+def median_ms(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+# ---------- page reruns ----------
+def bench_pages(repeat):
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for page in PAGES:
+        at = AppTest.from_file(APP, default_timeout=120)
+        at.session_state["page"] = page
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"{page} page raised: {at.exception}")
+        results[f"page_rerun_{page}"] = median_ms(at.run, repeat, warmup=0)
+    return results
+
+
+# ---------- calculations ----------
+def bench_calculations(repeat):
+    from advisor.engine import PROFILE_COLUMNS, compute_snapshot, snapshot_for
+    from advisor.goals import Goal, allocate
+    from advisor.whatif import whatif_grid
+
+    single = dict(monthly_income=60000, monthly_expenses=55000, current_savings=150000,
+                  total_debt=0, current_investments=50000, goal_amount=5000000)
+    rng = np.random.default_rng(0)
+    batch = {c: rng.integers(0, 200_000, 100_000) for c in PROFILE_COLUMNS}
+    goals = [Goal(f"goal{i}", int(rng.integers(10_000, 5_000_000)), int(rng.integers(1, 360)),
+                  int(rng.integers(1, 5))) for i in range(48)]
+    return {
+        "snapshot_single": median_ms(lambda: snapshot_for(**single), repeat * 10),
+        "snapshot_batch_100k": median_ms(lambda: compute_snapshot(batch), repeat),
+        # Uncached: what a new set of sidebar values pays for the 50x50 grid
+        "whatif_grid_50x50": median_ms(lambda: whatif_grid.__wrapped__(60000, 55000, 150000, 200000, 5000000, 60),
+                                       repeat),
+        "goal_allocation_48x360": median_ms(lambda: allocate(goals, 60000), repeat * 10),
+    }
+
+
+# ---------- data loading ----------
+def _notebook_load_and_aggregate():
+    import pandas as pd
+
+    df = pd.read_csv(DATASET_PATH)
+    df.columns = df.columns.str.strip()
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values("date").reset_index(drop=True)
+    return df.groupby(pd.Grouper(key="date", freq="ME")).agg({
+        "monthly_income": "mean", "monthly_expense_total": "mean",
+        "actual_savings": "mean", "credit_score": "mean",
+    })
+
+
+def _cached_load_and_aggregate():
+    from advisor.data import load_dataset
+    from advisor.monthly import AGG_COLUMNS, MonthlyAggregateStore
+
+    df = load_dataset(("date",) + tuple(AGG_COLUMNS))
+    return MonthlyAggregateStore.from_frame(df).frame()
+
+
+def bench_data(repeat):
+    return {
+        "load_aggregate_csv": median_ms(_notebook_load_and_aggregate, repeat),
+        "load_aggregate_cached": median_ms(_cached_load_and_aggregate, repeat),
+    }
+
+
+# ---------- inference ----------
+def bench_inference(repeat):
+    from advisor import predictor
+
+    if not predictor.model_available():
+        print("  (no model artifacts, skipping inference)")
+        return {}
+    model = predictor.get_predictor()
+    scaler_mean = np.array([3500.0, 3000.0, 2500.0, 680.0])
+    rng = np.random.default_rng(0)
+
+    results = {}
+    for size in INFERENCE_BATCHES:
+        X = np.abs(rng.normal(scaler_mean, scaler_mean * 0.3, size=(size, 4)))
+        # Uncached path: exactly what predict_finance pays on a cache miss
+        runs = max(1, repeat if size < 100_000 else repeat // 3)
+        forest, scaler = model.artifacts_for(size)
+        results[f"inference_batch_{size}"] = median_ms(
+            lambda: forest.predict(scaler.transform(X)), runs
+        )
+    return results
+
+
+GROUPS = {
+    "pages": bench_pages,
+    "calculations": bench_calculations,
+    "data": bench_data,
+    "inference": bench_inference,
+}
+
+
+def compare(results, baseline, threshold):
+    """Names whose time regressed beyond ``threshold`` relative to ``baseline``."""
+    regressions = []
+    for name, ms in results.items():
+        before = baseline.get(name)
+        if before and ms > before * (1 + threshold):
+            regressions.append((name, before, ms))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown vs baseline as a fraction (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--only", nargs="*", choices=sorted(GROUPS), help="run only these groups")
+    args = parser.parse_args(argv)
+
+    # Read the baseline first: --output may point at the same file
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)["results_ms"]
+
+    results = {}
+    for group, bench in GROUPS.items():
+        if args.only and group not in args.only:
+            continue
+        print(f"[{group}]")
+        for name, ms in bench(args.repeat).items():
+            results[name] = ms
+            print(f"  {name:<28} {ms:10.2f} ms")
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results_ms": results,
+    }
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Wrote {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.2f} ms -> {after:.2f} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import math
+
+from advisor.anomaly import FEATURES, StreamingScorer
+
+
+def _rows(n, value=100.0, **extra):
+    return [{"user_id": 1, "date": f"2024-01-{i + 1:02d}", **{f: value + i % 3 for f in FEATURES}, **extra}
+            for i in range(n)]
+
+
+def test_blank_fraud_flag_on_flagged_row():
+    spike = {"user_id": 1, "date": "2024-02-01", "fraud_flag": math.nan, **{f: 1e5 for f in FEATURES}}
+    alerts = list(StreamingScorer().score_rows(_rows(20, fraud_flag=0) + [spike]))
+    assert len(alerts) == 1
+    assert alerts[0].fraud_flag == 0
+
+
+def test_fraud_flag_kept_when_numeric():
+    spike = {"user_id": 1, "fraud_flag": 1.0, **{f: 1e5 for f in FEATURES}}
+    assert [a.fraud_flag for a in StreamingScorer().score_rows(_rows(20) + [spike])] == [1]
+
+
+def test_nan_feature_row_does_not_poison_stats():
+    blank = {"user_id": 1, **{f: math.nan for f in FEATURES}}
+    spike = {"user_id": 1, **{f: 1e5 for f in FEATURES}}
+    scorer = StreamingScorer()
+    alerts = list(scorer.score_rows(_rows(20) + [blank, spike]))
+    assert [a.row for a in alerts] == [21]
+    assert all(math.isfinite(m) for m in scorer.users[1].mean)
@@ -0,0 +1,40 @@
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from advisor import api
+
+
+@pytest.fixture
+def server():
+    srv = api.serve(port=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_oversized_body_closes_the_connection(server):
+    with socket.create_connection(server.server_address, timeout=5) as sock:
+        sock.sendall(b"POST /v1/advice HTTP/1.1\r\nHost: x\r\nContent-Length: 99999999999\r\n\r\n"
+                     b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n")
+        data = b""
+        while chunk := sock.recv(65536):
+            data += chunk
+    assert data.startswith(b"HTTP/1.1 400")
+    assert data.count(b"HTTP/1.1 ") == 1  # the trailing bytes were not served as a request
+
+
+def test_unexpected_error_is_a_json_500(server, monkeypatch, capsys):
+    def boom(body):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(api, "advise", boom)
+    conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+    conn.request("POST", "/v1/advice", b"{}")
+    response = conn.getresponse()
+    assert response.status == 500
+    assert json.loads(response.read()) == {"error": "internal server error"}
@@ -0,0 +1,25 @@
+import pandas as pd
+
+from advisor.monthly import MonthlyAggregateStore
+
+
+def _row(date):
+    return pd.DataFrame({"date": [date], "monthly_income": [1000.0], "monthly_expense_total": [600.0],
+                         "actual_savings": [400.0], "credit_score": [700.0]})
+
+
+def test_empty_store_round_trips(tmp_path):
+    path = str(tmp_path / "store.npz")
+    MonthlyAggregateStore().save(path)
+    store = MonthlyAggregateStore.load(path)
+    assert store.first_month is None
+    assert len(store.append(_row("2020-03-04"))) == 1
+
+
+def test_store_round_trips(tmp_path):
+    path = str(tmp_path / "store.npz")
+    store = MonthlyAggregateStore.from_frame(_row("2020-03-04"))
+    store.save(path)
+    loaded = MonthlyAggregateStore.load(path)
+    assert loaded.first_month == store.first_month
+    assert len(loaded.append(_row("2020-05-01"))) == 3
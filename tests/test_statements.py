@@ -0,0 +1,34 @@
+import io
+
+import pytest
+
+from advisor.statements import StatementError, import_statement
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"", "empty"),
+    ("Date,Amount\n25/01/2024,Caf\xe9\n".encode("latin-1"), "UTF-8"),
+    (b'Date,Amount\n"2024-01-01,1\n', "valid CSV"),
+    (b"Date,Amount\n2024-01-01,abc\n", "numbers"),
+])
+def test_unreadable_uploads_raise_statement_error(data, message):
+    with pytest.raises(StatementError, match=message):
+        import_statement(io.BytesIO(data))
+
+
+@pytest.mark.parametrize("dates, dayfirst", [
+    (("05/01/2024", "25/03/2024"), True),
+    (("01/05/2024", "03/25/2024"), False),
+    (("2024-01-05", "2024-03-25"), False),
+])
+def test_date_order_is_detected(dates, dayfirst):
+    csv = "Date,Amount\n" + "".join(f"{d},100\n" for d in dates)
+    summary = import_statement(io.StringIO(csv))
+    assert summary["dayfirst"] is dayfirst
+    assert summary["months"] == ["2024-01", "2024-02", "2024-03"]
+
+
+def test_averages_span_empty_months():
+    summary = import_statement(io.StringIO("Date,Amount\n2024-01-05,900\n2024-03-05,-300\n"))
+    assert summary["monthly_income"] == 300
+    assert summary["monthly_expenses"] == 100
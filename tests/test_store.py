@@ -0,0 +1,33 @@
+import sqlite3
+import time
+from datetime import date
+
+import pytest
+
+from advisor.store import Store
+
+
+def _count(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+
+
+def test_failed_bulk_insert_rolls_back(tmp_path):
+    store = Store(str(tmp_path / "finance.db"))
+    with pytest.raises(sqlite3.Error):
+        store.record_snapshots([("u", "2024-01", 1, 2, 3, 4, 5), ("u", "2024-02", 1)])
+    assert not store.conn.in_transaction
+    store.record_snapshot("u", date(2024, 3, 1), net_worth=1.0)
+    store.flush()
+    assert store.goal_history("u")[0]["date"] == "2024-03"
+    store.close()
+
+
+def test_queued_write_is_flushed_by_the_timer(tmp_path):
+    path = str(tmp_path / "finance.db")
+    store = Store(path, flush_interval=0.05)
+    store.record_snapshot("u", date(2024, 1, 1), net_worth=1.0)
+    assert _count(path) == 0
+    time.sleep(0.3)
+    assert _count(path) == 1
+    store.close()